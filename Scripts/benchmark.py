@@ -0,0 +1,270 @@
+'''
+Benchmark suite for every day.
+The parse phase (read_input) and the solve functions of each day are timed
+separately over repeated runs, recording wall time, CPU time and tracemalloc
+peak memory. Results are written as a JSON report that can be compared
+against a stored baseline to spot regressions.
+
+Usage: python Scripts/benchmark.py [--days 1 5] [--repeat 5]
+       [--output report.json] [--baseline baseline.json] [--threshold 0.1]
+'''
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+# Parse phase and solve functions of each day. The parse function takes the
+# day module and the input path; the solve functions also take the parsed
+# input. Days 1, 2 and 4 read their input inside their solve functions, and
+# the parse phase of day 11 is the one of run.py (galaxies and their index)
+BENCHMARKS = {
+    1: (
+        lambda day, file: list(day.read_input(file)),
+        {
+            'calibrate(1)': lambda day, file, parsed: day.calibrate(1, file),
+            'calibrate(2)': lambda day, file, parsed: day.calibrate(2, file),
+        }
+    ),
+    2: (
+        lambda day, file: list(day.read_input(file)),
+        {
+            'give_solutions': lambda day, file, parsed: day.give_solutions(file),
+        }
+    ),
+    3: (
+        lambda day, file: day.read_input(file),
+        {
+            'sum_part_numbers':
+                lambda day, file, parsed: day.sum_part_numbers(parsed),
+            'sum_gear_ratios':
+                lambda day, file, parsed: day.sum_gear_ratios(parsed),
+        }
+    ),
+    4: (
+        lambda day, file: list(day.read_input(file)),
+        {
+            'calculate_total_points':
+                lambda day, file, parsed: day.calculate_total_points(file),
+        }
+    ),
+    5: (
+        lambda day, file: day.read_input(file),
+        {
+            'solve1': lambda day, file, parsed: day.solve1(parsed[0], parsed[2]),
+            'solve2': lambda day, file, parsed: day.solve2(parsed[1], parsed[2]),
+        }
+    ),
+    6: (
+        lambda day, file: day.read_input(file),
+        {
+            'count_wins_batch':
+                lambda day, file, parsed: day.count_wins_batch(*parsed),
+            'count_wins(concatenated)':
+                lambda day, file, parsed: day.count_wins(*map(day.concatenate, parsed)),
+        }
+    ),
+    7: (
+        lambda day, file: day.read_input(file),
+        {
+            'calculate_winnings(1)':
+                lambda day, file, parsed: day.calculate_winnings(parsed, 1),
+            'calculate_winnings(2)':
+                lambda day, file, parsed: day.calculate_winnings(parsed, 2),
+        }
+    ),
+    8: (
+        lambda day, file: day.read_input(file),
+        {
+            'navigate_network1':
+                lambda day, file, parsed: day.navigate_network1(*parsed),
+            'navigate_network2':
+                lambda day, file, parsed: day.navigate_network2(*parsed),
+            'navigate_network2(vectorized)':
+                lambda day, file, parsed: day.navigate_network2(*parsed, vectorized=True),
+        }
+    ),
+    11: (
+        lambda day, file: day.expansion_index(*day.read_galaxies(file)),
+        {
+            'read_galaxies': lambda day, file, parsed: day.read_galaxies(file),
+            'expansion_index':
+                lambda day, file, parsed: day.expansion_index(
+                    parsed[2], tuple(len(counts) for counts in parsed[3])
+                ),
+            'total_distance(2)':
+                lambda day, file, parsed: day.total_distance(parsed, 2),
+            'total_distance(1_000_000)':
+                lambda day, file, parsed: day.total_distance(parsed, 1_000_000),
+            'pair_distances(1_000_000)':
+                lambda day, file, parsed: day.pair_distances(
+                    parsed, range(len(parsed[2][0]) - 1), range(1, len(parsed[2][0])), 1_000_000
+                ),
+        }
+    ),
+}
+
+def measure(function: Callable[[], Any], repeat: int) -> tuple[Any, dict[str, float]]:
+    '''
+    Runs a function 'repeat' times recording wall and CPU times, plus one more
+    run under tracemalloc to record its peak memory without slowing down the
+    timed runs.
+
+    Parameters
+    ----------
+    function : Callable[[], Any]
+        Function to measure.
+    repeat : int
+        Number of timed runs.
+
+    Returns
+    -------
+    tuple[Any, dict[str, float]]
+        1) result: return value of the last run.
+        2) stats: minimum and median wall time, median CPU time (seconds) and
+        peak memory (bytes).
+    '''
+    wall_times, cpu_times = [], []
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = function()
+        wall_times.append(time.perf_counter() - wall)
+        cpu_times.append(time.process_time() - cpu)
+
+    # Peak memory of a separate run
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = {
+        'wall_min': min(wall_times),
+        'wall_median': statistics.median(wall_times),
+        'cpu_median': statistics.median(cpu_times),
+        'peak_memory': peak
+    }
+
+    return result, stats
+
+def benchmark_day(day: int, file: str, repeat: int) -> dict[str, dict[str, float]]:
+    '''
+    Imports the module of a day and measures its parse phase and each of its
+    solve functions.
+
+    Parameters
+    ----------
+    day : int
+        Advent of Code day.
+    file : str
+        Path to the input file.
+    repeat : int
+        Number of timed runs per phase.
+
+    Returns
+    -------
+    dict[str, dict[str, float]]
+        Statistics of each phase.
+    '''
+    module = importlib.import_module(f'day{day}')
+    parse, solvers = BENCHMARKS[day]
+
+    # Parse phase
+    parsed, stats = measure(lambda: parse(module, file), repeat)
+    results = {'read_input': stats}
+
+    # Solve functions on the parsed input
+    for name, solve in solvers.items():
+        _, results[name] = measure(lambda: solve(module, file, parsed), repeat)
+
+    return results
+
+def compare(
+        report: dict[str, Any],
+        baseline: dict[str, Any],
+        threshold: float
+        ) -> list[str]:
+    '''
+    Compares the median wall times and peak memory of a report against a
+    baseline report and lists the phases that got worse by more than the
+    threshold.
+
+    Parameters
+    ----------
+    report : dict[str, Any]
+        Current report.
+    baseline : dict[str, Any]
+        Baseline report.
+    threshold : float
+        Allowed relative increase (0.1 = 10 %).
+
+    Returns
+    -------
+    list[str]
+        Human-readable description of each regression.
+    '''
+    regressions = []
+    for day, phases in report['results'].items():
+        for phase, stats in phases.items():
+            reference = baseline['results'].get(day, {}).get(phase)
+            if reference is None:
+                continue
+            for metric in ('wall_median', 'peak_memory'):
+                if stats[metric] > reference[metric]*(1 + threshold):
+                    regressions.append(
+                        f'{day} {phase} {metric}: '
+                        f'{reference[metric]:.6g} -> {stats[metric]:.6g}'
+                    )
+
+    return regressions
+
+def main():
+    '''Program process'''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--days', type=int, nargs='+', default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--inputs', default='Inputs', help='folder with dayN.txt')
+    parser.add_argument('--output', help='path of the JSON report')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    # Time the real parsing instead of the parsed input cache
+    os.environ.setdefault('AOC_CACHE', '0')
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': {}
+    }
+
+    for day in args.days:
+        file = f'{args.inputs}/day{day}.txt'
+        report['results'][f'day{day}'] = results = benchmark_day(day, file, args.repeat)
+        for phase, stats in results.items():
+            print(
+                f'day{day:<3} {phase:<30} '
+                f'{stats["wall_median"]*1000:10.3f} ms '
+                f'{stats["peak_memory"]/2**20:10.3f} MiB'
+            )
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as handle:
+            regressions = compare(report, json.load(handle), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+if __name__ ==  '__main__':
+    main()
@@ -4,25 +4,50 @@ Day 1: Trebuchet?!
 https://adventofcode.com/2023/day/1
 '''
 
-from typing import Generator, Literal
+import re
+from typing import Generator, Iterator, Literal
 
-def read_input(file: str) -> Generator[str, None, None]:
+from inputs import input_path, read_lines
+from profiling import counted, profiled
+from sharding import map_shards
+
+def read_input(file: str | None) -> Generator[str, None, None]:
     '''
     Builds a generator yielding each line of the Advent of Code input file. 
 
     Parameters
     ----------
-    file: str
-        Path to the input file.
+    file: str | None
+        Path to the input file, '-' or None for stdin.
     Returns
     -------
     Generator[str, None, None]:
         Each line of the input file.
     '''
-    with open(file, 'r') as handle:
-        for line in handle.readlines():
-            yield line.strip()
-
+    yield from read_lines(file)
+
+# Dictionary to translate to integers
+WORDS_TO_DIGITS = {
+    'zero' : 0,
+    'one' : 1,
+    'two' : 2,
+    'three' : 3,
+    'four' : 4,
+    'five' : 5,
+    'six' : 6,
+    'seven' : 7,
+    'eight' : 8,
+    'nine': 9    
+}
+
+# Digits (exercise 1) and also their words (exercise 2). The lookahead makes
+# the matches overlap, so 'twone' gives both 'two' and 'one'
+DIGIT_PATTERNS = {
+    1: re.compile(r'(?=(\d))'),
+    2: re.compile(r'(?=(\d|' + '|'.join(WORDS_TO_DIGITS) + r'))')
+}
+
+@counted
 def digit_search(
         string: str, 
         side: Literal['front', 'back'], 
@@ -50,85 +75,139 @@ def digit_search(
     -------
     Digit wanted
     '''
+    # Overlapping matches from left to right
+    digits = DIGIT_PATTERNS[exercise].findall(string)
+    digit = digits[0] if side == 'front' else digits[-1]
 
-    # Initialize dictionary to translate to integers
-    words_to_digits = {
-        'zero' : 0,
-        'one' : 1,
-        'two' : 2,
-        'three' : 3,
-        'four' : 4,
-        'five' : 5,
-        'six' : 6,
-        'seven' : 7,
-        'eight' : 8,
-        'nine': 9    
-    }
-
-    # Determine which indeces to look with
-    if side == 'front':
-        indeces = range(len(string)) # 0, 1, 2, 3, ..., len() - 1
-    elif side == 'back':
-        indeces = range(len(string) - 1, -1, -1) # len() - 1, len() - 2, ..., 0
-
-    # Loop over the string characters
-    for index in indeces:
-
-        # Check if character is a digit 
-        char = string[index]
-        if char.isdigit():
-            return int(char)
-        
-        # Skip the rest for exersice 1
-        if exercise == 1:
-            continue
-        
-        # If no digits have been found, the substrting from the index point
-        # until the beginning (front) or the end (back) is alphabetic
-        if side == 'front':
-            alphabetic = string[: index + 1]
-        elif side == 'back':
-            alphabetic = string[index:]
-
-        # Check if the alphabetic sequence corresponds to any digit
-        for word_number in words_to_digits:
-            if word_number in alphabetic:
-                return int(words_to_digits[word_number])
-
-def calibrate(exercise: Literal[1, 2]) -> int:
+    return int(digit) if digit.isdigit() else WORDS_TO_DIGITS[digit]
+
+@counted
+def calibration_values(string: str) -> tuple[int, int]:
     '''
-    Calculate the calibration values and its sum.
+    Finds the first and last digits of a string for both exercises in a 
+    single left to right pass of the exercise 2 pattern, since every digit 
+    found by exercise 1 is also found by exercise 2.
 
-    Paramaters
+    Parameters
     ----------
-    exercise: Literal[1, 2]
-        1 if first AoC exercise
-        2 if second AoC exercise
+    string: str
+        Each input line where the digits must be found
 
     Returns
     -------
-    Sum of all calibration values
+    tuple[int, int]
+        Calibration value of the line for exercise 1 and exercise 2 (0 if the
+        line has no digits).
+    '''
+    # Initialize first and last digits of both exercises
+    first1, last1, first2, last2 = None, 0, None, 0
+
+    for word_number in DIGIT_PATTERNS[2].findall(string):
+        if word_number.isdigit():
+            last1 = last2 = int(word_number)
+            if first1 is None:
+                first1 = last1
+        else:
+            last2 = WORDS_TO_DIGITS[word_number]
+        if first2 is None:
+            first2 = last2
+
+    return (first1 or 0)*10 + last1, (first2 or 0)*10 + last2
+
+def calibrate_lines(lines: Iterator[str]) -> tuple[int, int]:
+    '''
+    Calculate the sum of the calibration values of some lines for both 
+    exercises.
+
+    Parameters
+    ----------
+    lines: Iterator[str]
+        Input lines.
+
+    Returns
+    -------
+    tuple[int, int]
+        Sum of the calibration values for exercise 1 and exercise 2
     '''
 
-    # Initialize general sum
-    calibration_sum = 0
+    # Initialize general sums
+    calibration_sum1, calibration_sum2 = 0, 0
 
     # Iterate over input lines
-    for line in read_input('Inputs/day1.txt'):
+    for line in lines:
+        value1, value2 = calibration_values(line)
+        calibration_sum1 += value1
+        calibration_sum2 += value2
+
+    return calibration_sum1, calibration_sum2
+
+@profiled('day1.solve')
+def calibrate_both(file: str | None = 'Inputs/day1.txt') -> tuple[int, int]:
+    '''
+    Calculate the calibration values and their sum for both exercises with a
+    single read of the input file.
+
+    Parameters
+    ----------
+    file: str | None
+        Path to the input file, '-' or None for stdin.
 
-        # Get first (decenas) and last (unidades) digits
-        first_digit = digit_search(line, 'front', exercise) * 10 
-        last_digit = digit_search(line, 'back', exercise)
+    Returns
+    -------
+    tuple[int, int]
+        Sum of all calibration values for exercise 1 and exercise 2
+    '''
+    return calibrate_lines(read_input(file))
+
+def calibrate_sharded(
+        file: str = 'Inputs/day1.txt', 
+        processes: int | None = None
+        ) -> tuple[int, int]:
+    '''
+    Multi-core version of calibrate_both(): the input file is split into 
+    shards that are calibrated in parallel and whose sums are added up.
+
+    Parameters
+    ----------
+    file: str
+        Path to the input file.
+    processes: int | None
+        Number of worker processes (all cores by default).
+
+    Returns
+    -------
+    tuple[int, int]
+        Sum of all calibration values for exercise 1 and exercise 2
+    '''
+    partial_sums = map_shards(calibrate_lines, file, processes)
+    return tuple(sum(sums) for sums in zip((0, 0), *partial_sums))
 
-        # Add them to the sum
-        calibration_sum += first_digit + last_digit
+def calibrate(
+        exercise: Literal[1, 2], 
+        file: str | None = 'Inputs/day1.txt'
+        ) -> int:
+    '''
+    Calculate the calibration values and its sum.
+
+    Paramaters
+    ----------
+    exercise: Literal[1, 2]
+        1 if first AoC exercise
+        2 if second AoC exercise
 
-    return calibration_sum
+    file: str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    Sum of all calibration values
+    '''
+    return calibrate_both(file)[exercise - 1]
 
 def main():
     '''Program process'''
-    print(calibrate(1))
-    print(calibrate(2))
+    for calibration_sum in calibrate_both(input_path(1)):
+        print(calibration_sum)
 
 if __name__ ==  '__main__':
     main()
\ No newline at end of file
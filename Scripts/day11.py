@@ -4,89 +4,250 @@ Day 11: Cosmic Expansion
 https://adventofcode.com/2023/day/11
 '''
 
+from typing import Generator
+
 import numpy as np
 
-def read_input(file: str) -> np.ndarray:
+from grid import grid_layout, read_grid
+from inputs import input_path, map_input
+from parse_cache import cached_parse
+from profiling import profiled
+
+# Precomputed sums and prefix counts of expansion_index()
+ExpansionIndex = tuple[int, int, tuple[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+
+@cached_parse(version=2)
+def read_input(file: str | None) -> np.ndarray:
     '''
-    Reads the input file and converts its content into a 2D numpy array where
-    each element is either a galaxy '#' or empty space '.'.
+    Reads the input file with the shared grid loader into a 2D numpy array of
+    character codes where each element is either a galaxy '#' or empty space 
+    '.'.
 
     Parameters
     ----------
-    file : str
-        Path to the input file.
+    file : str | None
+        Path to the input file, '-' or None for stdin.
 
     Returns
     -------
     np.ndarray
         Space matrix.
     '''
-    with open(file, 'r') as handle:
-        return np.array([tuple(line.strip()) for line in handle.readlines()])
+    return read_grid(file)
+
+def galaxy_blocks(
+        buffer: np.ndarray, 
+        chunk_rows: int = 4096
+        ) -> Generator[tuple[np.ndarray, np.ndarray], None, None]:
+    '''
+    Scans a grid file viewed as a uint8 buffer block by block of rows and 
+    yields the coordinates of the galaxies in each block, so the character
+    matrix is never built and the memory used only depends on the size of the
+    blocks.
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        Bytes of the grid file.
+    chunk_rows : int
+        Number of rows scanned at once.
+
+    Yields
+    ------
+    Generator[tuple[np.ndarray, np.ndarray], None, None]
+        Row and column coordinates of the galaxies in each block of rows.
+    '''
+    n_rows, width, stride = grid_layout(buffer)
+
+    for first_row in range(0, n_rows, chunk_rows):
+        block = buffer[first_row*stride : (first_row + chunk_rows)*stride]
+
+        # Pad the last line if it does not end with a new line character
+        if len(block) % stride:
+            padding = np.zeros(stride - len(block) % stride, dtype=np.uint8)
+            block = np.concatenate((block, padding))
+
+        rows, cols = np.nonzero(block.reshape(-1, stride)[:, :width] == ord('#'))
+        yield rows + first_row, cols
+
+def stream_galaxies(
+        file: str | None, 
+        chunk_rows: int = 4096
+        ) -> Generator[tuple[np.ndarray, np.ndarray], None, None]:
+    '''
+    Memory-maps the input file with map_input() as a zero-copy uint8 buffer 
+    and yields the coordinates of the galaxies block by block of rows with
+    galaxy_blocks().
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+    chunk_rows : int
+        Number of rows scanned at once.
+
+    Yields
+    ------
+    Generator[tuple[np.ndarray, np.ndarray], None, None]
+        Row and column coordinates of the galaxies in each block of rows.
+    '''
+    buffer = np.frombuffer(map_input(file), dtype=np.uint8)
+    yield from galaxy_blocks(buffer, chunk_rows)
+
+@profiled('day11.parse')
+@cached_parse(version=1)
+def read_galaxies(
+        file: str | None
+        ) -> tuple[tuple[np.ndarray, np.ndarray], tuple[int, int]]:
+    '''
+    Collects the galaxy coordinates of the memory-mapped input file together
+    with the shape of the space matrix, which is all distance_coordinates()
+    needs.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    tuple[tuple[np.ndarray, np.ndarray], tuple[int, int]]
+        1) galaxies: row and column coordinates of the galaxies.
+        2) shape: number of rows and columns of the space matrix.
+    '''
+    buffer = np.frombuffer(map_input(file), dtype=np.uint8)
+    n_rows, width, _ = grid_layout(buffer)
+
+    # Initialize coordinates with empty blocks in case there are no galaxies
+    rows, cols = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    for block_rows, block_cols in galaxy_blocks(buffer):
+        rows.append(block_rows)
+        cols.append(block_cols)
+
+    return (np.concatenate(rows), np.concatenate(cols)), (n_rows, width)
     
-def manhattan(galaxy_h: tuple[int, int], galaxy_v:tuple[int, int]) -> int:
+def empty_before(coordinates: np.ndarray, size: int) -> np.ndarray:
+    '''
+    Counts, for every index along one axis of the space matrix, how many rows
+    (or columns) without galaxies lie before it. The counts are the cumulative
+    sum of the empty mask, so any galaxy pair can look up the number of
+    expansion events between them by subtraction.
+
+    Parameters
+    ----------
+    coordinates : np.ndarray
+        Coordinates of the galaxies along the axis.
+    size : int
+        Number of rows (or columns) of the space matrix.
+
+    Returns
+    -------
+    np.ndarray
+        Number of empty rows (or columns) before each index.
     '''
-    Calculates the Manhattan distance of to points in the space grid given their
-    horizontal and vertical coordinates.
+    is_empty = np.bincount(coordinates, minlength=size) == 0
+    return np.cumsum(is_empty) - is_empty
+
+def pairwise_sum(coordinates: np.ndarray) -> int:
+    '''
+    Calculates the sum of the absolute differences between every pair of
+    coordinates in O(n log n). Once sorted, the k-th coordinate is greater than
+    or equal to the k previous ones, so its contribution is k times its value
+    minus the prefix sum of the previous coordinates.
 
     Parameters
     ----------
-    galaxy_h : tuple[int, int]
-        Tuple of horizontal coordinates of the galaxies.
-    galaxy_v : tuple[int, int]
-        Tuple of vertical coordinates of the galaxies.
+    coordinates : np.ndarray
+        Coordinates along one axis.
 
     Returns
     -------
     int
-        Manhattan distance.
+        Sum of the pairwise absolute differences.
     '''
-    return np.abs(galaxy_h[1] - galaxy_h[0]) + np.abs(galaxy_v[1] - galaxy_v[0])
+    coordinates = np.sort(coordinates).astype(np.int64)
+    prefix = np.cumsum(coordinates) - coordinates
+    return int(np.sum(coordinates * np.arange(len(coordinates)) - prefix))
 
-def empty(
-        space: np.ndarray, 
-        galaxies: tuple[np.ndarray, np.ndarray]
-        ) -> tuple[np.ndarray, np.ndarray]:
+def distance_coordinates(
+        galaxies: tuple[np.ndarray, np.ndarray], 
+        shape: tuple[int, int], 
+        constant: int
+        ) -> int:
     '''
-    Locating the position of the galaxies also gives us the information of the
-    rows and columns that are empty space. This is done by seeing which indeces 
-    are missing in the horizontal and vertical indeced of the galaxies.
+    The distance between two galaxies after the expansion is the Manhattan
+    distance in the unexpanded space plus (expansion constant - 1) times the
+    number of rows and cols without galaxies between them. Both terms are
+    summed over every pair at once per axis with pairwise_sum(), using the
+    cumulative counts of empty rows and columns as coordinates for the second
+    term, instead of looping over the pairs.
 
     Parameters
     ----------
-    space : np.ndarray
-        Space matrix.
     galaxies : tuple[np.ndarray, np.ndarray]
-        Tuple with the vertical coordinates array of the galaxies in the first
-        position anf the horizontal coordinates array of the galaxies in the
-        second position.
+        Row and column coordinates of the galaxies.
+    shape : tuple[int, int]
+        Number of rows and columns of the space matrix.
+    constant : int
+        Expansion constant.
 
     Returns
     -------
-    tuple[np.ndarray, np.ndarray]
-        Row and column indeces where there is no galaxy.
+    int
+        Sum of the distances between every pair of galaxies.
     '''
-    n_empty_h = np.setdiff1d(np.arange(space.shape[0]), galaxies[0])
-    n_empty_v = np.setdiff1d(np.arange(space.shape[1]), galaxies[1])
+    return total_distance(expansion_index(galaxies, shape), constant)
 
-    return n_empty_h, n_empty_v
+@profiled('day11.index')
+def expansion_index(
+        galaxies: tuple[np.ndarray, np.ndarray], 
+        shape: tuple[int, int]
+        ) -> ExpansionIndex:
+    '''
+    Precomputes everything the distances need for any expansion constant,
+    since they are linear in it: the sum of the unexpanded distances and the
+    number of empty rows and cols crossed, summed over every pair with
+    pairwise_sum(), and the prefix counts of empty rows and cols for pair
+    queries.
 
-def distance_galaxies(space: np.ndarray, constant: int) -> int:
+    Parameters
+    ----------
+    galaxies : tuple[np.ndarray, np.ndarray]
+        Row and column coordinates of the galaxies.
+    shape : tuple[int, int]
+        Number of rows and columns of the space matrix.
+
+    Returns
+    -------
+    ExpansionIndex
+        1) distance_sum: sum of the unexpanded distances of every pair.
+        2) n_empty: sum of the empty rows and cols crossed by every pair.
+        3) galaxies: row and column coordinates of the galaxies.
+        4) empty_counts: number of empty rows and cols before each index.
+    '''
+    galaxies = tuple(np.asarray(axis, dtype=np.int64) for axis in galaxies)
+    empty_counts = tuple(
+        empty_before(galaxies[axis], size) for axis, size in enumerate(shape)
+    )
+
+    # Sum of the distances and of the expansion events between every pair
+    distance_sum, n_empty = 0, 0
+    for axis in range(2):
+        distance_sum += pairwise_sum(galaxies[axis])
+        n_empty += pairwise_sum(empty_counts[axis][galaxies[axis]])
+
+    return distance_sum, n_empty, galaxies, empty_counts
+
+@profiled('day11.distance')
+def total_distance(index: ExpansionIndex, constant: int) -> int:
     '''
-    The space matrix is used first to locate the galaxies and the rows and 
-    columns without galaxies. To calculate the distance between galaxy pairs 
-    after expansion we need to know how many expansion events happen between the
-    galaxies. For that, the indeces of the galaxies are used to check for rows
-    and columns wihtout galaxies. With this the distance after the expansion can 
-    be calculated as the sum of:
-    - Manhattan distance between the galaxies in the unexpanded space
-    - Expansion constant * number of rows and cols without galaxies
-    - Number of rows and cols without galaxies
+    Sum of the distances between every pair of galaxies for an expansion
+    constant in O(1) from the expansion_index().
 
     Parameters
     ----------
-    space : np.ndarray
-        Space matrix.
+    index : ExpansionIndex
+        Precomputed expansion index.
     constant : int
         Expansion constant.
 
@@ -95,37 +256,74 @@ def distance_galaxies(space: np.ndarray, constant: int) -> int:
     int
         Sum of the distances between every pair of galaxies.
     '''
-    # Initialize return variable
-    distance_sum = 0
-    # Locate galaxies in space
-    galaxies = np.where(space == '#')
-    # Locate rows and columns with no galaxies
-    n_empty_h, n_empty_v = empty(space, galaxies)
-    
-    # Iterate over each pair of galaxies (without overlap)
-    for i in range(len(galaxies[0])):
-        for j in range(i + 1, len(galaxies[0])):
+    distance_sum, n_empty, _, _ = index
+
+    # Python ints avoid overflows with big expansion constants
+    return distance_sum + n_empty*(constant - 1)
+
+def pair_distances(
+        index: ExpansionIndex, 
+        first: np.ndarray, 
+        second: np.ndarray, 
+        constant: int
+        ) -> np.ndarray:
+    '''
+    Distances after the expansion between batches of galaxy pairs, each in
+    O(1): the unexpanded Manhattan distance plus (expansion constant - 1)
+    times the empty rows and cols between both galaxies, which are the
+    differences of their prefix counts.
+
+    Parameters
+    ----------
+    index : ExpansionIndex
+        Precomputed expansion index.
+    first : np.ndarray
+        Index of the first galaxy of each pair (in reading order).
+    second : np.ndarray
+        Index of the second galaxy of each pair.
+    constant : int
+        Expansion constant.
 
-            # Useful sort of horizontal and vertical indeces of galaxies
-            galaxies_h = sorted((galaxies[0][i], galaxies[0][j]))
-            galaxies_v = sorted((galaxies[1][i], galaxies[1][j]))
+    Returns
+    -------
+    np.ndarray
+        Distance between the galaxies of each pair.
+    '''
+    _, _, galaxies, empty_counts = index
+
+    distances = 0
+    for coordinates, counts in zip(galaxies, empty_counts):
+        first_coordinates, second_coordinates = coordinates[first], coordinates[second]
+        distances = distances + np.abs(second_coordinates - first_coordinates) + (
+            np.abs(counts[second_coordinates] - counts[first_coordinates])*(constant - 1)
+        )
+
+    return distances
 
-            # Calculate the number of rows and cols without galaxies
-            n_empty_row = len([i for i in n_empty_h if galaxies_h[0] < i < galaxies_h[1]])
-            n_empty_col = len([i for i in n_empty_v if galaxies_v[0] < i < galaxies_v[1]])
-            n_empty = n_empty_row + n_empty_col
+def distance_galaxies(space: np.ndarray, constant: int) -> int:
+    '''
+    Locates the galaxies in the space matrix and calculates the sum of their 
+    distances after the expansion with distance_coordinates().
 
-            # Calculate distance after expansion 
-            distance = manhattan(galaxies_h, galaxies_v)
-            distance_sum += distance + n_empty*constant - n_empty
+    Parameters
+    ----------
+    space : np.ndarray
+        Space matrix.
+    constant : int
+        Expansion constant.
 
-    return distance_sum
+    Returns
+    -------
+    int
+        Sum of the distances between every pair of galaxies.
+    '''
+    return distance_coordinates(np.where(space == ord('#')), space.shape, constant)
 
 def main():
     '''Program process'''
-    space = read_input('Inputs/day11.txt')
-    print(distance_galaxies(space, 2))
-    print(distance_galaxies(space, 1_000_000))
+    index = expansion_index(*read_galaxies(input_path(11)))
+    print(total_distance(index, 2))
+    print(total_distance(index, 1_000_000))
 
 if __name__ ==  '__main__':
     main()
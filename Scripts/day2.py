@@ -4,31 +4,79 @@ Day 2: Cube Conundrum
 https://adventofcode.com/2023/day/2
 '''
 
-from typing import Generator, Tuple
+import re
+from typing import Generator, Iterator, Tuple
 
-def read_input(file: str) -> Generator[str, None, None]:
+import numpy as np
+
+from inputs import input_path, read_lines
+from profiling import profiled
+from sharding import map_shards
+
+def read_input(file: str | None) -> Generator[str, None, None]:
     '''
     Builds a generator yielding each line of the Advent of Code input file. 
 
     Parameters
     ----------
-    file: str
-        Path to the input file.
+    file: str | None
+        Path to the input file, '-' or None for stdin.
 
     Yields
     -------
     Generator[str, None, None]:
         Each line of the input file.
     '''
-    with open(file, 'r') as handle:
-        for line in handle.readlines():
-            yield line.strip()
+    yield from read_lines(file)
+
+def parse_game(line: str) -> Tuple[int, dict[str, int]]:
+    '''
+    Takes a game line and returns its ID and how many cubes per color are 
+    needed for the game to be possible.
+
+    Parameters
+    ----------
+    line : str
+        Game line -> 'Game 1: 3 blue, 4 red; 1 red, 2 green'
+
+    Returns
+    -------
+    Tuple[int, dict[str, int]]
+        Game ID and dictionary with 'red', 'green' and 'blue' as keys and their
+        respective maximum number of cubes in the game.
+    '''
+        
+    # Initialize empty dictionary color : max cubes
+    cube_tally = {
+        'red' : 0,
+        'green' : 0, 
+        'blue' : 0
+    }
 
-def cubes_per_game() -> Generator[Tuple[int, dict[str, int]], None, None]:
+    # Get game ID
+    game_info, cube_info = line.split(': ')
+    game_id = int(game_info[5:])
+
+    # Update dict with max number of cubes per color in all sets
+    for cubes in cube_info.replace(';', ',').split(', '):
+        n_cubes, color = cubes.split(' ')
+        if int(n_cubes) > cube_tally[color]:
+            cube_tally[color] = int(n_cubes)
+
+    return game_id, cube_tally
+
+def cubes_per_game(
+        file: str | None = 'Inputs/day2.txt'
+        ) -> Generator[Tuple[int, dict[str, int]], None, None]:
     '''
     Takes each game line and yields its ID and how many cubes per color are 
     needed for the game to be possible.
 
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
     Yields
     ------
     Generator[Tuple[int, dict[str, int]], None, None]
@@ -37,26 +85,8 @@ def cubes_per_game() -> Generator[Tuple[int, dict[str, int]], None, None]:
     '''
 
     # Read line
-    for line in read_input('Inputs/day2.txt'):
-        
-        # Initialize empty dictionary color : max cubes
-        cube_tally = {
-            'red' : 0,
-            'green' : 0, 
-            'blue' : 0
-        }
-
-        # Get game ID
-        game_info, cube_info = line.split(': ')
-        game_id = int(game_info[5:])
-
-        # Update dict with max number of cubes per color in all sets
-        for cubes in cube_info.replace(';', ',').split(', '):
-            n_cubes, color = cubes.split(' ')
-            if int(n_cubes) > cube_tally[color]:
-                cube_tally[color] = int(n_cubes)
-
-        yield game_id, cube_tally
+    for line in read_input(file):
+        yield parse_game(line)
 
 def check_possibility_configuration(cube_tally: dict[str, int]) -> bool:
     '''
@@ -91,16 +121,20 @@ def check_possibility_configuration(cube_tally: dict[str, int]) -> bool:
     # Returns true as default
     return True
 
-def give_solutions() -> str:
+def game_sums(lines: Iterator[str]) -> Tuple[int, int]:
     '''
-    Take the cube tally per color of all games and calculate the sum of
+    Take the cube tally per color of some games and calculate the sum of
     possible games and the sum of the power.
 
+    Parameters
+    ----------
+    lines : Iterator[str]
+        Game lines.
+
     Returns
     -------
-    str
-        Human-readible string with the sum of possible games (solution 1) and 
-        the sum of the power (solution 2)
+    Tuple[int, int]
+        Sum of possible games (solution 1) and sum of the power (solution 2)
     '''
 
     # Initialize return variables
@@ -108,7 +142,7 @@ def give_solutions() -> str:
     power_sum = 0
 
     # Iterate over the game IDs and the maximum cubes found
-    for game_id, cube_tally in cubes_per_game():
+    for game_id, cube_tally in map(parse_game, lines):
 
         # Power = minumum configuration of cubes for the game to be valid
         power_sum += cube_tally['red'] * cube_tally['green'] * cube_tally['blue']
@@ -117,11 +151,139 @@ def give_solutions() -> str:
         if check_possibility_configuration(cube_tally):
             possible_games_sum += game_id
     
+    return possible_games_sum, power_sum
+
+@profiled('day2.solve')
+def give_solutions(file: str | None = 'Inputs/day2.txt') -> str:
+    '''
+    Take the cube tally per color of all games and calculate the sum of
+    possible games and the sum of the power.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    str
+        Human-readible string with the sum of possible games (solution 1) and 
+        the sum of the power (solution 2)
+    '''
+    possible_games_sum, power_sum = game_sums(read_input(file))
+    
     return f'Solution 1: {possible_games_sum},  solution 2: {power_sum}'
 
+def give_solutions_sharded(
+        file: str = 'Inputs/day2.txt', 
+        processes: int | None = None
+        ) -> Tuple[int, int]:
+    '''
+    Multi-core version of give_solutions(): the input file is split into 
+    shards whose games are checked in parallel and whose sums are added up.
+
+    Parameters
+    ----------
+    file : str
+        Path to the input file.
+    processes : int | None
+        Number of worker processes (all cores by default).
+
+    Returns
+    -------
+    Tuple[int, int]
+        Sum of possible games (solution 1) and sum of the power (solution 2)
+    '''
+    partial_sums = map_shards(game_sums, file, processes)
+    return tuple(sum(sums) for sums in zip((0, 0), *partial_sums))
+
+# Column of each color in the game table
+COLORS = {'red': 0, 'green': 1, 'blue': 2}
+
+# Number of cubes and color of every draw of a game
+DRAW_PATTERN = re.compile(r'(\d+) (red|green|blue)')
+
+def read_game_table(file: str | None = 'Inputs/day2.txt') -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Parses all the games in bulk into a columnar table: the game IDs and an
+    (n_games, 3) integer array with the maximum number of red, green and blue
+    cubes of each game. The draws of every game are collected first and 
+    reduced per game and color at once with np.maximum.at().
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Game IDs and maximum number of cubes per game and color.
+    '''
+    game_ids, games, colors, n_cubes = [], [], [], []
+
+    for game, line in enumerate(read_input(file)):
+        game_info, cube_info = line.split(': ')
+        game_ids.append(int(game_info[5:]))
+        for n, color in DRAW_PATTERN.findall(cube_info):
+            games.append(game)
+            colors.append(COLORS[color])
+            n_cubes.append(int(n))
+
+    # Maximum per game and color
+    maxima = np.zeros((len(game_ids), 3), dtype=np.int64)
+    np.maximum.at(maxima, (games, colors), n_cubes)
+
+    return np.array(game_ids, dtype=np.int64), maxima
+
+def check_configurations(
+        game_ids: np.ndarray, 
+        maxima: np.ndarray, 
+        configurations: np.ndarray, 
+        chunk_size: int = 1024
+        ) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Checks many bag configurations at once by broadcasting the (n_games, 3)
+    table of maxima against the (n_configurations, 3) array of configurations.
+    Configurations are processed in chunks to bound the size of the 
+    (configurations, games) boolean matrix of possible games.
+
+    Parameters
+    ----------
+    game_ids : np.ndarray
+        Game IDs.
+    maxima : np.ndarray
+        Maximum number of red, green and blue cubes per game.
+    configurations : np.ndarray
+        Number of red, green and blue cubes of each configuration.
+    chunk_size : int
+        Number of configurations checked at once.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        For each configuration, sum of the IDs of the possible games 
+        (solution 1) and sum of the power of the possible games (solution 2
+        when every game is possible).
+    '''
+    configurations = np.asarray(configurations, dtype=np.int64).reshape(-1, 3)
+    powers = maxima.prod(axis=1)
+
+    # Initialize return variables
+    id_sums = np.zeros(len(configurations), dtype=np.int64)
+    power_sums = np.zeros(len(configurations), dtype=np.int64)
+
+    for start in range(0, len(configurations), chunk_size):
+        chunk = configurations[start : start + chunk_size]
+        possible = (maxima[None, :, :] <= chunk[:, None, :]).all(axis=2)
+        id_sums[start : start + chunk_size] = possible @ game_ids
+        power_sums[start : start + chunk_size] = possible @ powers
+
+    return id_sums, power_sums
+
 def main():
     '''Program process'''
-    print(give_solutions())
+    print(give_solutions(input_path(2)))
 
 if __name__ ==  '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,125 @@
+'''
+Welcome to Advent of Code!
+Day 3: Gear Ratios
+https://adventofcode.com/2023/day/3
+'''
+
+import numpy as np
+
+from grid import NEIGHBOURS, adjacent, label_runs, read_grid, run_numbers
+from inputs import input_path
+from parse_cache import cached_parse
+from profiling import profiled
+
+@profiled('day3.parse')
+@cached_parse(version=1)
+def read_input(file: str | None) -> np.ndarray:
+    '''
+    Reads the engine schematic as a 2D uint8 array of character codes with the
+    shared grid loader.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    np.ndarray
+        Engine schematic.
+    '''
+    return read_grid(file)
+
+def label_numbers(schematic: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Labels the numbers of the engine schematic (horizontal runs of digits) and
+    reads their values.
+
+    Parameters
+    ----------
+    schematic : np.ndarray
+        Engine schematic.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        1) labels: label of the number each cell belongs to (0 if none).
+        2) numbers: value of each number, indexed by label.
+    '''
+    is_digit = (schematic >= ord('0')) & (schematic <= ord('9'))
+    labels = label_runs(is_digit)
+
+    return labels, run_numbers(schematic, labels)
+
+@profiled('day3.part1')
+def sum_part_numbers(schematic: np.ndarray) -> int:
+    '''
+    Part numbers are the numbers with any digit adjacent to a symbol (anything
+    that is not a digit or a period). The cells adjacent to symbols are found
+    for the whole schematic at once and every number touching one of them is
+    added up.
+
+    Parameters
+    ----------
+    schematic : np.ndarray
+        Engine schematic.
+
+    Returns
+    -------
+    int
+        Sum of the part numbers.
+    '''
+    labels, numbers = label_numbers(schematic)
+    is_symbol = (labels == 0) & (schematic != ord('.'))
+
+    # Numbers with any digit next to a symbol
+    part_labels = np.unique(labels[adjacent(is_symbol) & (labels > 0)])
+
+    return int(numbers[part_labels].sum())
+
+@profiled('day3.part2')
+def sum_gear_ratios(schematic: np.ndarray) -> int:
+    '''
+    Gears are '*' symbols adjacent to exactly two numbers and their ratio is
+    the product of both numbers. The labels of the 8 neighbours of every '*'
+    are gathered into a (stars, 8) array, whose rows are sorted to count the
+    different numbers around each '*'.
+
+    Parameters
+    ----------
+    schematic : np.ndarray
+        Engine schematic.
+
+    Returns
+    -------
+    int
+        Sum of the gear ratios.
+    '''
+    labels, numbers = label_numbers(schematic)
+    stars = np.nonzero(schematic == ord('*'))
+
+    # Labels around every '*' (0 outside the schematic), sorted per '*'
+    padded = np.pad(labels, 1)
+    around = np.sort(np.stack([
+        padded[stars[0] + 1 + rows, stars[1] + 1 + cols] for rows, cols in NEIGHBOURS
+    ], axis=1), axis=1)
+
+    # Different numbers: non-zero labels not equal to the previous one
+    previous = np.zeros_like(around)
+    previous[:, 1:] = around[:, :-1]
+    different = (around > 0) & (around != previous)
+
+    # Product of the two numbers of the gears
+    gears = different.sum(axis=1) == 2
+    ratios = np.where(different, numbers[around], 1).prod(axis=1)
+
+    return int(ratios[gears].sum())
+
+def main():
+    '''Program process'''
+    schematic = read_input(input_path(3))
+    print(sum_part_numbers(schematic))
+    print(sum_gear_ratios(schematic))
+
+if __name__ ==  '__main__':
+    main()
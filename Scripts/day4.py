@@ -4,32 +4,63 @@ Day 4: Scratchcards
 https://adventofcode.com/2023/day/4
 '''
 
+from array import array
 from collections import defaultdict
-from typing import Generator, Iterator
+from itertools import chain
+from typing import Generator, Iterable, Iterator
 
-def read_input(file: str) -> Generator[str, None, None]:
+import numpy as np
+
+from inputs import input_path, read_lines
+from profiling import profiled
+from sharding import map_shards
+
+def read_input(file: str | None) -> Generator[str, None, None]:
     '''
     Builds a generator yielding each line of the Advent of Code input file. 
 
     Parameters
     ----------
-    file: str
-        Path to the input file.
+    file: str | None
+        Path to the input file, '-' or None for stdin.
 
     Yields
     -------
     Generator[str, None, None]:
         Each line of the input file.
     '''
-    with open(file, 'r') as handle:
-        for line in handle.readlines():
-            yield line.strip()
+    yield from read_lines(file)
+
+def count_matches(stratchcard: str) -> int:
+    '''
+    Formats a scratchcard using the split() method and returns the number of
+    common numbers between the winning numbers and the elf's numbers using
+    set().
+
+    Parameters
+    ----------
+    stratchcard : str
+        Scratchcard line -> 'Card 1: 41 48 83 | 83 86 6'
+
+    Returns
+    -------
+    int
+        Number of common numbers between the winning numbers and the elf's 
+        numbers.
+    '''
+    numbers = stratchcard.split(':')[1]
+    winning_numbers, elf_numbers = [nums.split() for nums in numbers.split('|')]
+    return len(set(winning_numbers) & set(elf_numbers))
 
-def get_matches() -> Iterator[int]:
+def get_matches(file: str | None = 'Inputs/day4.txt') -> Iterator[int]:
     '''
-    Reads and formats each scratchcard using the split() method and yield the 
-    number of common numbers between the winning numbers and the elf's numbers 
-    using set().
+    Reads each scratchcard and yields the number of common numbers between the
+    winning numbers and the elf's numbers with count_matches().
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
 
     Yields
     ------
@@ -38,10 +69,25 @@ def get_matches() -> Iterator[int]:
         numbers.
     '''
 
-    for stratchcard in read_input('Inputs/day4.txt'):
-        numbers = stratchcard.split(':')[1]
-        winning_numbers, elf_numbers = [nums.split() for nums in numbers.split('|')]
-        yield len(set(winning_numbers) & set(elf_numbers))
+    for stratchcard in read_input(file):
+        yield count_matches(stratchcard)
+
+def shard_matches(stratchcards: Iterator[str]) -> array:
+    '''
+    Counts the matches of the scratchcards of a shard. They are returned as a
+    compact array because part 2 needs them in card order.
+
+    Parameters
+    ----------
+    stratchcards : Iterator[str]
+        Scratchcard lines.
+
+    Returns
+    -------
+    array
+        Number of matches of each scratchcard.
+    '''
+    return array('B', map(count_matches, stratchcards))
     
 def calculate_scratchcard_points(matches: int) -> int:
     '''
@@ -67,17 +113,24 @@ def calculate_scratchcard_points(matches: int) -> int:
     else:
         return 2**(matches - 1)
 
-def calculate_total_points() -> tuple[int, int]:
+def total_points(matches_per_card: Iterable[int]) -> tuple[int, int]:
     '''
     Solves part 1 by summing up all the points for all the scratchcards
-    Solves part 2 by creating a dictionary card_number : copy_number and update
-        it with every card according to the current iterating card and its 
-        number of matches ->
+    Solves part 2 with a running difference array: a card with n copies and m
+        matches adds n copies to the next m cards, which is recorded as +n at
+        the next card and -n after the last one. The running sum of the 
+        differences gives the copies won by each card, so the total is 
+        linear in the number of cards ->
         1: 1
         2: 2
         3: 4
         ...
 
+    Parameters
+    ----------
+    matches_per_card : Iterable[int]
+        Number of matches of each scratchcard, in card order.
+
     Returns
     -------
     tuple[int, int]
@@ -85,28 +138,144 @@ def calculate_total_points() -> tuple[int, int]:
         Total amount of cards (solution 2)
     '''
     # Initialize part 1 and 2 variables
-    total_points = 0
-    scratchcards = defaultdict(int) # Dict with 0 as values
+    total_points, total_cards = 0, 0
+    running_copies = 0
+    differences = defaultdict(int) # Dict with 0 as values
 
     # Iterate over the card number and the matches in it
-    for card_number, matches in enumerate(get_matches()):
+    for card_number, matches in enumerate(matches_per_card):
 
         # Solve part 1
         total_points += calculate_scratchcard_points(matches)
         
         # Solve part 2
-        # Add original 
-        scratchcards[card_number] += 1
-        # Add copies
-        for n_cards_below in range(1, matches + 1):
-            scratchcards[card_number + n_cards_below] += scratchcards[card_number]
+        # Original plus copies won by the previous cards
+        running_copies += differences.pop(card_number, 0)
+        n_cards = 1 + running_copies
+        total_cards += n_cards
+        # Add copies to the cards below
+        if matches:
+            differences[card_number + 1] += n_cards
+            differences[card_number + matches + 1] -= n_cards
+
+    return total_points, total_cards
+
+def parse_bitsets(stratchcards: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Parses all the scratchcards at once into 128-bit sets of their winning 
+    numbers and their elf's numbers (all numbers are below 100), stored as two
+    uint64 words per card. Every card must have the same amount of numbers.
+
+    Parameters
+    ----------
+    stratchcards : Iterable[str]
+        Scratchcard lines.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Bitsets of the winning numbers and of the elf's numbers, shape 
+        (cards, 2).
+    '''
+    # Numbers of every card in a single array
+    lines = [line for line in stratchcards if line]
+    if not lines:
+        return np.zeros((0, 2), dtype=np.uint64), np.zeros((0, 2), dtype=np.uint64)
+    n_winning = len(lines[0].split(':')[1].split('|')[0].split())
+    numbers = np.array(
+        [line.split(':')[1].replace('|', ' ').split() for line in lines], 
+        dtype=np.uint64
+    ).reshape(len(lines), -1)
 
-    return total_points, sum(scratchcards.values())
+    # Bit of each number in its word
+    bits = np.left_shift(np.uint64(1), numbers & np.uint64(63))
+    words = numbers >> np.uint64(6)
 
+    def bitset(columns: slice) -> np.ndarray:
+        # OR the bits of the numbers of each word
+        return np.stack([
+            np.bitwise_or.reduce(
+                np.where(words[:, columns] == word, bits[:, columns], np.uint64(0)), 
+                axis=1
+            )
+            for word in (0, 1)
+        ], axis=1)
+
+    return bitset(slice(None, n_winning)), bitset(slice(n_winning, None))
+
+@profiled('day4.solve')
+def calculate_total_points_bitset(
+        file: str | None = 'Inputs/day4.txt'
+        ) -> tuple[int, int]:
+    '''
+    Vectorized version of calculate_total_points(): the matches of all the 
+    cards are the popcount of the intersection of their bitsets, computed with
+    NumPy for every card at once, and part 2 uses the difference array of 
+    total_points().
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    tuple[int, int]
+        Total amount of points (solution 1)
+        Total amount of cards (solution 2)
+    '''
+    winning, elf = parse_bitsets(read_input(file))
+    matches = np.bitwise_count(winning & elf).sum(axis=1)
+
+    return total_points(matches.tolist())
+
+def calculate_total_points(
+        file: str | None = 'Inputs/day4.txt'
+        ) -> tuple[int, int]:
+    '''
+    Solves both parts with total_points() from the matches of the input 
+    scratchcards.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    tuple[int, int]
+        Total amount of points (solution 1)
+        Total amount of cards (solution 2)
+    '''
+    return total_points(get_matches(file))
+
+def calculate_total_points_sharded(
+        file: str = 'Inputs/day4.txt', 
+        processes: int | None = None
+        ) -> tuple[int, int]:
+    '''
+    Multi-core version of calculate_total_points(): the matches of the 
+    scratchcards are counted in parallel shard by shard and chained in card
+    order before solving both parts, since copies depend on card indices.
+
+    Parameters
+    ----------
+    file : str
+        Path to the input file.
+    processes : int | None
+        Number of worker processes (all cores by default).
+
+    Returns
+    -------
+    tuple[int, int]
+        Total amount of points (solution 1)
+        Total amount of cards (solution 2)
+    '''
+    return total_points(chain(*map_shards(shard_matches, file, processes)))
 
 def main():
     '''Program process'''
-    print(calculate_total_points())
+    print(calculate_total_points_bitset(input_path(4)))
     
 if __name__ ==  '__main__':
     main()
\ No newline at end of file
@@ -1,75 +1,498 @@
 '''
 Welcome to Advent of Code!
-Day 5: If you give a seed a fertilizer 
+Day 5: If you give a seed a fertilizer
 https://adventofcode.com/2023/day/5
 '''
 
-from typing import Generator
-
-def read_input(file: str) -> Generator[str, None, None]:
-
-    with open(file, 'r') as handle:
-        lines = handle.readlines()
-        seeds1 = [int(seed) for seed in lines[0][6:].split()]
-
-        seeds2 = [0]*(len(seeds1)//2)
-        for n, pair in enumerate(range(0, len(seeds1), 2)):
-            start = seeds1[pair]
-            stop = start + seeds1[pair + 1]
-            print(start, stop)
-            seeds2[n] = range(start, stop)
-        #seeds2 = [range(seeds1[pair], seeds1[pair + 1]) for pair in range(0, len(seeds1), 2)]
-        #print(seeds2)
-        
-        maps = {}
-        for line in lines[2:]:
-            if line.endswith('map:\n'):
-                map_name = line[:-5]
-                maps[map_name] = []
-            elif line != '\n':
-                numbers = [int(number) for number in line.split()]
-                maps[map_name].append(numbers)
-
-        return seeds1, seeds2, maps
-    
-def use_map(seed = 1, map = [[0, 222541565, 2]]):
-
-    for map_part in map:
-        if map_part[1] < seed < map_part[1] + map_part[2]:
-            return map_part[0] + seed - map_part[1]
-        
-    return seed
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+import numpy as np
+
+from inputs import input_path, read_lines
+from parse_cache import cached_parse
+from profiling import counted, profiled
+
+# Map compiled into a piecewise-linear table: sorted segment starts (the first
+# one is always 0) and the offset added to every number in each segment. The
+# segment i covers [starts[i], starts[i + 1]) and the last one is unbounded.
+Table = tuple[list[int], list[int]]
+
+@profiled('day5.parse')
+@cached_parse(version=1)
+def read_input(file: str | None) -> tuple[list[int], list[range], dict[str, Table]]:
+    '''
+    Reads the Advent of Code input file and returns the seeds of both problems
+    and the maps compiled into sorted, gap-filled tables with compile_map().
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    tuple[list[int], list[range], dict[str, Table]]
+        1) seeds1: list of seeds (problem 1).
+        2) seeds2: list of seed ranges (problem 2).
+        3) maps: dictionary with map names as keys and their tables as values.
+    '''
+
+    lines = read_lines(file)
+    seeds1 = [int(seed) for seed in next(lines)[6:].split()]
+
+    seeds2 = [0]*(len(seeds1)//2)
+    for n, pair in enumerate(range(0, len(seeds1), 2)):
+        start = seeds1[pair]
+        stop = start + seeds1[pair + 1]
+        seeds2[n] = range(start, stop)
+
+    map_parts = {}
+    for line in lines:
+        if line.endswith(' map:'):
+            map_name = line.removesuffix(' map:')
+            map_parts[map_name] = []
+        elif line:
+            numbers = [int(number) for number in line.split()]
+            map_parts[map_name].append(numbers)
+
+    maps = {name: compile_map(parts) for name, parts in map_parts.items()}
+
+    return seeds1, seeds2, maps
+
+def compile_map(map_parts: list[list[int]]) -> Table:
+    '''
+    Compiles the [destination start, source start, length] map parts into a
+    table sorted by source start in which the gaps between map parts are
+    filled with segments of offset 0 (numbers mapped to themselves), so that
+    any number can be looked up with a binary search.
+
+    Parameters
+    ----------
+    map_parts : list[list[int]]
+        List of [destination start, source start, length] map parts.
+
+    Returns
+    -------
+    Table
+        Segment starts and offsets.
+    '''
+    # Initialize return variables
+    starts, offsets = [], []
+
+    # Walk the map parts in source order filling the gaps between them
+    position = 0
+    for destination, source, length in sorted(map_parts, key=lambda x: x[1]):
+        if source > position:
+            starts.append(position)
+            offsets.append(0)
+        starts.append(source)
+        offsets.append(destination - source)
+        position = source + length
+
+    # Numbers after the last map part are mapped to themselves
+    starts.append(position)
+    offsets.append(0)
+
+    return starts, offsets
+
+def compose_maps(maps: dict[str, Table]) -> Table:
+    '''
+    Composes the tables of all the maps, in order, into a single seed to
+    location table. The composition of two piecewise-linear tables is again
+    piecewise-linear: each segment of the first table is split where its image
+    crosses a segment start of the second table.
+
+    Parameters
+    ----------
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values.
+
+    Returns
+    -------
+    Table
+        Segment starts and offsets of the composed map.
+    '''
+    # The identity table is the neutral element of the composition
+    composed = [0], [0]
+
+    for second in maps.values():
+        starts, offsets = [], []
+        first_starts, first_offsets = composed
+        for i, (start, offset) in enumerate(zip(first_starts, first_offsets)):
+
+            # End of the segment of the first table (the last is unbounded)
+            if i + 1 < len(first_starts):
+                stop = first_starts[i + 1]
+            else:
+                stop = float('inf')
+
+            # Segment of the second table where the image of start falls
+            j = bisect_right(second[0], start + offset) - 1
+
+            # Split the segment at every start of the second table it crosses
+            position = start
+            while position < stop:
+                total = offset + second[1][j]
+                # Merge contiguous segments with the same offset
+                if not offsets or offsets[-1] != total:
+                    starts.append(position)
+                    offsets.append(total)
+                j += 1
+                if j == len(second[0]):
+                    break
+                position = second[0][j] - offset
+
+        composed = starts, offsets
+
+    return composed
+
+@counted
+def use_map(seed: int, map: Table) -> int:
+    '''
+    Looks up the number a seed corresponds to in a map table using a binary
+    search over the segment starts.
+
+    Parameters
+    ----------
+    seed : int
+        Number to map.
+    map : Table
+        Segment starts and offsets.
+
+    Returns
+    -------
+    int
+        Mapped number.
+    '''
+    starts, offsets = map
+    return seed + offsets[bisect_right(starts, seed) - 1]
+
+@profiled('day5.part1')
 def solve1(seeds, maps):
-    seeds_locations = [0]*len(seeds)
+    '''
+    Composes all the maps into a single seed to location table, so that each
+    seed is located with one lookup instead of one per map.
+
+    Parameters
+    ----------
+    seeds : list[int]
+        Seeds.
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values.
+
+    Returns
+    -------
+    int
+        Lowest location number corresponding to any of the seeds.
+    '''
+    seed_to_location = compose_maps(maps)
+
+    return min(use_map(seed, seed_to_location) for seed in seeds)
+
+def map_ranges(
+        ranges: list[tuple[int, int]],
+        map: Table
+        ) -> list[tuple[int, int]]:
+    '''
+    Pushes whole [start, stop) intervals through a map instead of individual
+    seeds. Each interval is split at the boundaries of the table segments it
+    overlaps and every piece is shifted by the offset of its segment.
+
+    Parameters
+    ----------
+    ranges : list[tuple[int, int]]
+        List of [start, stop) intervals.
+    map : Table
+        Segment starts and offsets.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Mapped [start, stop) intervals.
+    '''
+    # Initialize return variable
+    mapped = []
+    starts, offsets = map
+
+    for start, stop in ranges:
 
-    for n, seed in enumerate(seeds):
-        for map in maps.values():
-            seed = use_map(seed, map)
-            
-        seeds_locations[n] = seed
+        # Segment where the interval begins
+        i = bisect_right(starts, start) - 1
 
-    return min(seeds_locations)
+        # Cut the interval segment by segment
+        while start < stop:
+            if i + 1 < len(starts):
+                piece_stop = min(stop, starts[i + 1])
+            else:
+                piece_stop = stop
+            mapped.append((start + offsets[i], piece_stop + offsets[i]))
+            start = piece_stop
+            i += 1
 
+    return mapped
+
+def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    '''
+    Sorts [start, stop) intervals and merges the ones that overlap or touch,
+    so overlapping seed ranges do not multiply the intervals stage by stage.
+
+    Parameters
+    ----------
+    ranges : list[tuple[int, int]]
+        List of [start, stop) intervals.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Sorted disjoint [start, stop) intervals.
+    '''
+    # Initialize return variable
+    merged = []
+
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+
+    return merged
+
+@profiled('day5.part2')
 def solve2(seeds, maps):
-    min_location = 490809890809226660576
-    for seed_range in seeds:
-        print('jey', min_location)
-        for seed in seed_range:
-            for map in maps.values():
-                seed = use_map(seed, map)
+    '''
+    Brute force is not possible for the second problem because seed ranges
+    contain billions of seeds. Instead, the [start, stop) intervals are pushed
+    through every map with map_ranges(), so the cost depends on the number of
+    intervals and map parts and not on the number of seeds. The intervals are
+    merged with merge_ranges() after every stage to keep their number bounded.
+    The lowest location is the lowest start of the final intervals.
+
+    Parameters
+    ----------
+    seeds : list[range]
+        Seed ranges.
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values.
+
+    Returns
+    -------
+    int
+        Lowest location number corresponding to any of the seeds.
+    '''
+    # Intervals to push through the maps
+    ranges = [(seed_range.start, seed_range.stop) for seed_range in seeds]
+
+    # Map the intervals stage by stage
+    for map in maps.values():
+        ranges = merge_ranges(map_ranges(ranges, map))
+
+    return min(start for start, _ in ranges)
+
+def map_array(seeds: np.ndarray, map: Table) -> np.ndarray:
+    '''
+    Vectorized use_map(): looks up a whole array of numbers in a map table
+    with a single np.searchsorted() over the segment starts.
+
+    Parameters
+    ----------
+    seeds : np.ndarray
+        int64 numbers to map.
+    map : Table
+        Segment starts and offsets.
+
+    Returns
+    -------
+    np.ndarray
+        Mapped numbers.
+    '''
+    starts, offsets = (np.asarray(column, dtype=np.int64) for column in map)
+    return seeds + offsets[np.searchsorted(starts, seeds, side='right') - 1]
+
+def map_seeds(seeds: np.ndarray, maps: dict[str, Table]) -> np.ndarray:
+    '''
+    Maps an array of seeds to their locations through every map in order.
+
+    Parameters
+    ----------
+    seeds : np.ndarray
+        int64 seeds.
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values.
+
+    Returns
+    -------
+    np.ndarray
+        Location of each seed.
+    '''
+    for map in maps.values():
+        seeds = map_array(seeds, map)
+    return seeds
+
+def chunk_minimum(start: int, stop: int, maps: dict[str, Table]) -> int:
+    '''
+    Lowest location of the seeds in [start, stop), mapped in one batch.
+
+    Parameters
+    ----------
+    start : int
+        First seed.
+    stop : int
+        Seed after the last one.
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values.
+
+    Returns
+    -------
+    int
+        Lowest location number corresponding to any of the seeds.
+    '''
+    return int(map_seeds(np.arange(start, stop, dtype=np.int64), maps).min())
+
+def solve2_brute_force(
+        seeds: list[range],
+        maps: dict[str, Table],
+        processes: int | None = None,
+        chunk_size: int = 1 << 20
+        ) -> int:
+    '''
+    Checks solve2() by mapping every single seed. The seed ranges are split
+    into chunks of 'chunk_size' seeds that are mapped with map_seeds() by a
+    process pool, and the minimums of the chunks are reduced.
+
+    Parameters
+    ----------
+    seeds : list[range]
+        Seed ranges.
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values.
+    processes : int | None
+        Number of worker processes (all cores by default, 1 to run in this
+        process).
+    chunk_size : int
+        Number of seeds mapped per batch.
+
+    Returns
+    -------
+    int
+        Lowest location number corresponding to any of the seeds.
+
+    Raises
+    ------
+    ValueError
+        If the seed ranges contain no seeds.
+    '''
+    chunks = [
+        (start, min(start + chunk_size, seed_range.stop))
+        for seed_range in seeds
+        for start in range(seed_range.start, seed_range.stop, chunk_size)
+    ]
+    if not chunks:
+        raise ValueError('There are no seeds in the seed ranges')
+    starts, stops = zip(*chunks)
+
+    if processes == 1:
+        return min(map(chunk_minimum, starts, stops, repeat(maps)))
+
+    with ProcessPoolExecutor(processes) as pool:
+        return min(pool.map(chunk_minimum, starts, stops, repeat(maps), chunksize=8))
+
+class Pipeline:
+    '''
+    Incremental evaluation of both problems for a fixed set of seeds while
+    individual maps are edited. The output of every stage (mapped seeds for
+    problem 1, mapped intervals for problem 2) is cached, so replacing a map
+    only recomputes that stage and the ones after it.
+
+    Parameters
+    ----------
+    seeds1 : list[int]
+        Seeds (problem 1).
+    seeds2 : list[range]
+        Seed ranges (problem 2).
+    maps : dict[str, Table]
+        Dictionary with map names as keys and their tables as values, in
+        stage order.
+    '''
+
+    def __init__(self, seeds1: list[int], seeds2: list[range], maps: dict[str, Table]):
+        self.maps = dict(maps)
+        self.names = list(maps)
+
+        # Output of the first i stages at index i (index 0 is the input)
+        self.values = [np.array(seeds1, dtype=np.int64)]
+        self.ranges = [[(seed_range.start, seed_range.stop) for seed_range in seeds2]]
+
+    def replace_map(self, name: str, map: Table):
+        '''
+        Replaces the table of a map, dropping the cached outputs of its stage
+        and of every later stage.
+
+        Parameters
+        ----------
+        name : str
+            Name of the map -> 'light-to-temperature'
+        map : Table
+            New segment starts and offsets, from compile_map().
+        '''
+        stage = self.names.index(name)
+        self.maps[name] = map
+        del self.values[stage + 1:]
+        del self.ranges[stage + 1:]
+
+    def locations(self) -> np.ndarray:
+        '''
+        Locations of the seeds of problem 1, mapping them only through the
+        stages whose output is not cached.
+
+        Returns
+        -------
+        np.ndarray
+            Location of each seed.
+        '''
+        for name in self.names[len(self.values) - 1:]:
+            self.values.append(map_array(self.values[-1], self.maps[name]))
+        return self.values[-1]
+
+    def location_ranges(self) -> list[tuple[int, int]]:
+        '''
+        Location intervals of the seed ranges of problem 2, mapping them only
+        through the stages whose output is not cached.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Location [start, stop) intervals.
+        '''
+        for name in self.names[len(self.ranges) - 1:]:
+            self.ranges.append(merge_ranges(map_ranges(self.ranges[-1], self.maps[name])))
+        return self.ranges[-1]
 
-        if seed < min_location:
-            min_location = seed
+    def solve1(self) -> int:
+        '''
+        Returns
+        -------
+        int
+            Lowest location number corresponding to any of the seeds.
+        '''
+        return int(self.locations().min())
 
-    return min_location
+    def solve2(self) -> int:
+        '''
+        Returns
+        -------
+        int
+            Lowest location number corresponding to any of the seed ranges.
+        '''
+        return min(start for start, _ in self.location_ranges())
 
 
 def main():
     '''Program process'''
-    seeds1, seeds2, maps = read_input('Inputs/day5.txt')
+    seeds1, seeds2, maps = read_input(input_path(5))
+    print(solve1(seeds1, maps))
     print(solve2(seeds2, maps))
-    #print(use_map())
 
 if __name__ ==  '__main__':
-    main()
\ No newline at end of file
+    main()
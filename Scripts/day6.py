@@ -0,0 +1,139 @@
+'''
+Welcome to Advent of Code!
+Day 6: Wait For It
+https://adventofcode.com/2023/day/6
+'''
+
+from math import isqrt, prod
+
+import numpy as np
+
+from inputs import input_path, read_lines, unlimited_digits
+from profiling import profiled
+
+# Largest race time and record distance handled with int64 arrays in batch
+# mode (the squared time and four times the record must not overflow)
+BATCH_TIME_LIMIT = 2**31
+BATCH_DISTANCE_LIMIT = 2**60
+
+@profiled('day6.parse')
+def read_input(file: str | None) -> tuple[list[int], list[int]]:
+    '''
+    Reads the Advent of Code input file and returns the time and the record
+    distance of every race.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    tuple[list[int], list[int]]
+        Time and record distance of each race.
+    '''
+    times, distances = (
+        [int(value) for value in line.split(':')[1].split()]
+        for line in read_lines(file) if line
+    )
+    return times, distances
+
+def concatenate(numbers: list[int]) -> int:
+    '''
+    Joins the digits of several numbers into a single one, which is how the
+    races are read in problem 2 (the spaces are bad kerning).
+
+    Parameters
+    ----------
+    numbers : list[int]
+        Numbers -> [7, 15, 30]
+
+    Returns
+    -------
+    int
+        Concatenated number -> 71530
+    '''
+    with unlimited_digits():
+        return int(''.join(map(str, numbers)))
+
+@profiled('day6.part2')
+def count_wins(time: int, distance: int) -> int:
+    '''
+    Counts the hold times h that beat the record, h*(time - h) > distance,
+    in constant time. They lie strictly between the roots of
+    h^2 - time*h + distance, (time ± sqrt(time^2 - 4*distance))/2. The
+    integer square root gives a lower bound at most two below the first
+    winning hold time, and the last one is symmetric.
+
+    Parameters
+    ----------
+    time : int
+        Duration of the race.
+    distance : int
+        Record distance.
+
+    Returns
+    -------
+    int
+        Number of ways to beat the record.
+    '''
+    discriminant = time*time - 4*distance
+    if discriminant <= 0:
+        return 0
+
+    # First winning hold time, at most two above the lower bound. There is
+    # none if both roots lie between the same two integers
+    hold = (time - isqrt(discriminant)) // 2
+    for _ in range(2):
+        hold += hold*(time - hold) <= distance
+
+    return time - 2*hold + 1 if hold*(time - hold) > distance else 0
+
+@profiled('day6.part1')
+def count_wins_batch(times: list[int], distances: list[int]) -> np.ndarray:
+    '''
+    Counts the ways to beat the record of many races at once. Races small
+    enough for int64 are solved with whole-array operations, using the float
+    square root corrected to the exact integer square root, and larger ones
+    fall back to count_wins() with Python integers.
+
+    Parameters
+    ----------
+    times : list[int]
+        Duration of each race.
+    distances : list[int]
+        Record distance of each race.
+
+    Returns
+    -------
+    np.ndarray
+        Number of ways to beat the record of each race.
+    '''
+    if max(times, default=0) >= BATCH_TIME_LIMIT or max(distances, default=0) >= BATCH_DISTANCE_LIMIT:
+        return np.array([count_wins(*race) for race in zip(times, distances)], dtype=object)
+
+    times = np.asarray(times, dtype=np.int64)
+    distances = np.asarray(distances, dtype=np.int64)
+    discriminants = np.maximum(times*times - 4*distances, 0)
+
+    # Exact integer square roots from the float estimates
+    roots = np.sqrt(discriminants.astype(np.float64)).astype(np.int64)
+    roots -= roots*roots > discriminants
+    roots += (roots + 1)*(roots + 1) <= discriminants
+
+    # First winning hold time, at most two above the lower bound
+    holds = (times - roots) // 2
+    for _ in range(2):
+        holds += holds*(times - holds) <= distances
+
+    return np.where(holds*(times - holds) > distances, times - 2*holds + 1, 0)
+
+def main():
+    '''Program process'''
+    times, distances = read_input(input_path(6))
+    with unlimited_digits():
+        print(prod(count_wins_batch(times, distances).tolist()))
+        print(count_wins(concatenate(times), concatenate(distances)))
+
+if __name__ ==  '__main__':
+    main()
@@ -4,18 +4,30 @@ Day 7: Camel Cards
 https://adventofcode.com/2023/day/7
 '''
 
-from typing import Literal
-from collections import Counter
-
-def read_input(file: str) -> list[list[str, str]]:
+import heapq
+import struct
+from functools import cache
+from itertools import combinations, combinations_with_replacement
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from typing import Generator, Literal
+
+import numpy as np
+
+from inputs import input_path, read_lines
+from parse_cache import cached_parse, cached_table
+from profiling import counted, profiled
+
+@profiled('day7.parse')
+@cached_parse(version=1)
+def read_input(file: str | None) -> list[list[str, str]]:
     '''
     Reads the Advent of Code input file and returns the hands and bids as lists
     of [hand, bid] lists.
 
     Parameters
     ----------
-    file : str
-        Path to the input file.
+    file : str | None
+        Path to the input file, '-' or None for stdin.
 
     Returns
     -------
@@ -25,22 +37,23 @@ def read_input(file: str) -> list[list[str, str]]:
 
     hands_bids = []
 
-    with open(file, 'r') as handle:
-        for line in handle.readlines():
-            hands_bids.append(line.strip().split())
+    for line in read_lines(file):
+        if line:
+            hands_bids.append(line.split())
     
     return hands_bids
 
-def hash_hand1(hand: str) -> str:
-    '''
-    Hashes the playing hand to an alphabetic code that eases the process of 
-    sorting using the 'key' argument of the sorting functions/methods. The 
-    hashing method is:
-    - 1 capital letter A-G according to the hand type.
-    - 5 lowercase letters a-m according to the rank of the sequencial cards.
-    This does not takes into account that J is a joker/placeholder card and has the
-    lowest rank (problem 1)
+# Cards sorted by rank (problem 1). The position of a card is its base-13 digit
+CARDS = '23456789TJQKA'
 
+# Binary layout of the (key, line, bid) records spilled to disk
+RECORD = struct.Struct('<qqq')
+
+@counted
+def encode_hand(hand: str) -> int:
+    '''
+    Packs a playing hand into a base-13 integer in which each card is a digit
+    according to its position in CARDS.
 
     Parameters
     ----------
@@ -49,121 +62,170 @@ def hash_hand1(hand: str) -> str:
 
     Returns
     -------
-    str
-        Hashed hand -> 'Faabdk'
-    '''
-
-    # Count the number of cards in each hand
-    card2count = Counter(hand)
-
-    # Rank hash dictionary
-    cards2rank = {
-        'A': 'a', 'K': 'b', 'Q': 'c', 'J': 'd', 
-        'T': 'e', '9': 'f', '8': 'g', '7': 'h',
-        '6': 'i', '5': 'j', '4': 'k', '3': 'l', '2': 'm'
-    }
-
-    # Sort per values
-    card_counts = sorted(card2count.values())
-
-    # Type hash conditionals
-    if card_counts == [5]:
-        hash = 'A'
-    elif card_counts == [1, 4]:
-        hash = 'B'
-    elif card_counts == [2, 3]:
-        hash = 'C'
-    elif card_counts == [1, 1, 3]:
-        hash = 'D'
-    elif card_counts == [1, 2, 2]:
-        hash = 'E'
-    elif card_counts == [1, 1, 1, 2]:
-        hash = 'F'
-    else:
-        hash = 'G'
-
-    # Concatenate the two hash parts
-    return hash + ''.join([cards2rank[card] for card in hand])
-
-def hash_hand2(hand: str) -> str:
-    '''
-    Hashes the playing hand to an alphabetic code that eases the process of 
-    sorting using the 'key' argument of the sorting functions/methods. The 
-    hashing method is:
-    - 1 capital letter A-G according to the hand type.
-    - 5 lowercase letters a-m according to the rank of the sequencial cards.
-    This takes into account that J is a joker/placeholder card and has the
-    lowest rank (problem 2)
+    int
+        Packed hand -> 370346
+    '''
+    code = 0
+    for card in hand:
+        code = code*13 + CARDS.index(card)
+    return code
 
+def hand_types(largest: np.ndarray, different: np.ndarray) -> np.ndarray:
+    '''
+    Ranks the type of every hand from 0 (high card) to 6 (five of a kind). 
+    The type only depends on the largest number of cards of the same kind and
+    on the number of different cards.
 
     Parameters
     ----------
-    hand : str
-        Playing hand -> 'AAKJ4'
+    largest : np.ndarray
+        Largest number of cards of the same kind per hand.
+    different : np.ndarray
+        Number of different cards per hand.
 
     Returns
     -------
-    str
-        Hashed hand -> 'Daabmj'
+    np.ndarray
+        Type rank of each hand.
+    '''
+    return np.select(
+        [
+            largest == 5,
+            largest == 4,
+            (largest == 3) & (different == 2),
+            largest == 3,
+            (largest == 2) & (different == 3),
+            largest == 2
+        ],
+        [6, 5, 4, 3, 2, 1],
+        default = 0
+    )
+
+@cache
+def pair_types() -> np.ndarray:
     '''
+    Tabulates the type of a hand from the number of pairs of equal cards that
+    are not jokers (0 to 10) and the number of jokers (0 to 5), which is 
+    enough to tell every grouping of the other cards apart. The jokers join
+    the largest group, which always gives the best type.
 
-    # Count the number of cards in each hand
-    card2count = Counter(hand)
+    Returns
+    -------
+    np.ndarray
+        Type rank indexed by (pairs, jokers), shape (11, 6).
+    '''
+    pairs, jokers, largest, different = [], [], [], []
+    for n_jokers in range(6):
+        for cards in combinations_with_replacement(range(5), 5 - n_jokers):
+            counts = [cards.count(card) for card in set(cards)]
+            pairs.append(sum(count*(count - 1) // 2 for count in counts))
+            jokers.append(n_jokers)
+            largest.append(max(counts, default=0) + n_jokers)
+            different.append(max(len(counts), 1))
+
+    table = np.zeros((11, 6), dtype=np.int32)
+    table[pairs, jokers] = hand_types(np.array(largest), np.array(different))
+    return table
+
+@cache
+@cached_table(version=1)
+def hand_table() -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Precomputes the sort key of all the 13^5 possible packed hands for both 
+    problems, so scoring a hand is a single indexed lookup. The key is the 
+    hand type rank followed by the five card ranks as base-13 digits, so 
+    stronger hands have bigger keys. The types come from pair_types() after
+    counting the pairs of equal cards of every hand. For problem 2 the J cards
+    are jokers and rank the lowest. The table is also cached on disk, so it
+    is only built once and not in every process.
 
-    # Rank hash dictionary
-    cards2rank = {
-        'A': 'a', 'K': 'b', 'Q': 'c', 'J': 'm', 
-        'T': 'd', '9': 'e', '8': 'f', '7': 'g',
-        '6': 'h', '5': 'i', '4': 'j', '3': 'k', '2': 'l'
-    }
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Sort keys indexed by packed hand for problem 1 and problem 2.
+    '''
+    # The packed hands form a 5D grid with one axis per card position, so
+    # anything that depends on the cards in some positions is broadcast from
+    # an array spanning only those axes
+    def along(values: np.ndarray, *axes: int) -> np.ndarray:
+        return values.reshape([13 if axis in axes else 1 for axis in range(5)])
+
+    joker = CARDS.index('J')
+    equal = np.eye(13, dtype=np.int8)
+    equal_cards = equal.copy()
+    equal_cards[joker, joker] = 0
+
+    # Pairs of equal cards, leaving out the jokers for problem 2
+    pairs1 = np.zeros((13,)*5, dtype=np.int8)
+    pairs2 = np.zeros((13,)*5, dtype=np.int8)
+    for first, second in combinations(range(5), 2):
+        pairs1 += along(equal, first, second)
+        pairs2 += along(equal_cards, first, second)
+
+    # Jokers and card ranks for problem 2: J ranks 0 and the cards below it
+    # move up one rank
+    jokers = np.zeros((13,)*5, dtype=np.int8)
+    ranks = np.zeros((13,)*5, dtype=np.int32)
+    joker_ranks = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 10, 11, 12], dtype=np.int32)
+    for position in range(5):
+        jokers += along(equal[joker], position)
+        ranks += along(joker_ranks*13**(4 - position), position)
+
+    # Problem 1: card digits are already their rank
+    types = pair_types()
+    keys1 = types[pairs1.ravel(), 0]*13**5 + np.arange(13**5, dtype=np.int32)
+    keys2 = types[pairs2.ravel(), jokers.ravel()]*13**5 + ranks.ravel()
+
+    return keys1, keys2
+
+@counted
+def hash_hand1(hand: str) -> int:
+    '''
+    Hashes the playing hand to an integer key that eases the process of 
+    sorting using the 'key' argument of the sorting functions/methods, by 
+    looking the packed hand up in hand_table(). This does not takes into 
+    account that J is a joker/placeholder card and has the lowest rank 
+    (problem 1)
 
-    # Transform the J card into the most convenient card
-    if 1 <= card2count.get('J', 0) <= 4:
+    Parameters
+    ----------
+    hand : str
+        Playing hand -> 'AAKJ4'
 
-        # J cards will transform into other cards
-        j = card2count.pop('J')
+    Returns
+    -------
+    int
+        Hashed hand, the bigger the stronger
+    '''
+    return int(hand_table()[0][encode_hand(hand)])
 
-        # If all cards are different, the J cards will morph into the one with
-        # highest rank in the hand. Otherwise, into the most frequent card
-        if len(card2count.values()) == 5:
-            most_convenient = min(card2count, key=lambda x: cards2rank[x])
-        else:
-            most_convenient = max(card2count, key=card2count.get)
+@counted
+def hash_hand2(hand: str) -> int:
+    '''
+    Hashes the playing hand to an integer key that eases the process of 
+    sorting using the 'key' argument of the sorting functions/methods, by 
+    looking the packed hand up in hand_table(). This takes into account that 
+    J is a joker/placeholder card and has the lowest rank (problem 2)
 
-        # Add the amount of J cards to the most convinient card type
-        card2count[most_convenient] += j
+    Parameters
+    ----------
+    hand : str
+        Playing hand -> 'AAKJ4'
 
-    # Edge case -> 'JJJJJ'
-    elif card2count.get('J', 0) == 5:
-        return 'Ammmmm'
-    
-    # Sort per values
-    card_counts = sorted(card2count.values())
-
-    # Type hash conditionals
-    if card_counts == [5]:
-        hash = 'A'
-    elif card_counts == [1, 4]:
-        hash = 'B'
-    elif card_counts == [2, 3]:
-        hash = 'C'
-    elif card_counts == [1, 1, 3]:
-        hash = 'D'
-    elif card_counts == [1, 2, 2]:
-        hash = 'E'
-    elif card_counts == [1, 1, 1, 2]:
-        hash = 'F'
-    else:
-        hash = 'G'
-
-    # Concatenate the two hash parts
-    return hash + ''.join([cards2rank[card] for card in hand])
+    Returns
+    -------
+    int
+        Hashed hand, the bigger the stronger
+    '''
+    return int(hand_table()[1][encode_hand(hand)])
     
+@profiled('day7.winnings')
 def calculate_winnings(hands_bids: list[list[str, str]], problem: Literal[1,2]) -> int:
     '''
-    Takes the list with hands and bids, sort it based on the hash function and
-    calculate the winnings as the sum of the bids times their position after
-    the sorting. Depending on the problem, a different hashing function is used.
+    Takes the list with hands and bids, sort it based on the precomputed keys
+    of the packed hands and calculate the winnings as the sum of the bids 
+    times their position after the sorting. Depending on the problem, a 
+    different table of keys is used.
 
     Parameters
     ----------
@@ -178,30 +240,120 @@ def calculate_winnings(hands_bids: list[list[str, str]], problem: Literal[1,2])
         Winnings
     '''
     
-    # Sort the hands based on the hashing and the problem
-    if problem == 1:
-        sorted_hands = sorted(
-            hands_bids, 
-            reverse = True, 
-            key = lambda x: hash_hand1(x[0])
-        )
-    elif problem == 2:
-        sorted_hands = sorted(
-            hands_bids, 
-            reverse = True, 
-            key = lambda x: hash_hand2(x[0])
-        )
-        
+    # Keys of the problem indexed by packed hand
+    keys = hand_table()[problem - 1]
+
+    # Sort the bids from the weakest to the strongest hand (stable, so equal
+    # hands keep the order of the file)
+    hand_keys = keys[[encode_hand(hand) for hand, _ in hands_bids]]
+    bids = np.array([int(bid) for _, bid in hands_bids], dtype=np.int64)
+    sorted_bids = bids[np.argsort(hand_keys, kind='stable')]
+
     # Calculate the winnings
-    winnings = 0
-    for rank, hand in enumerate(sorted_hands):
-        winnings += (rank + 1) * int(hand[1])
+    return int(sorted_bids @ np.arange(1, len(sorted_bids) + 1))
+
+def spill_chunk(records: list[tuple[int, int, int]], directory: str) -> str:
+    '''
+    Sorts a chunk of (key, line, bid) records and writes it to a temporary
+    binary file of fixed-size records.
+
+    Parameters
+    ----------
+    records : list[tuple[int, int, int]]
+        Sort key, line number and bid of each hand in the chunk.
+    directory : str
+        Directory where the temporary file is created.
+
+    Returns
+    -------
+    str
+        Path to the sorted chunk file.
+    '''
+    records.sort()
+    with NamedTemporaryFile('wb', dir=directory, delete=False) as handle:
+        for record in records:
+            handle.write(RECORD.pack(*record))
+    return handle.name
+
+def read_chunk(
+        file: str, 
+        buffer_records: int = 8192
+        ) -> Generator[tuple[int, int, int], None, None]:
+    '''
+    Reads back the records of a sorted chunk file a buffer at a time.
+
+    Parameters
+    ----------
+    file : str
+        Path to the sorted chunk file.
+    buffer_records : int
+        Number of records read at once.
+
+    Yields
+    ------
+    Generator[tuple[int, int, int], None, None]
+        Sort key, line number and bid of each hand.
+    '''
+    with open(file, 'rb') as handle:
+        while block := handle.read(RECORD.size*buffer_records):
+            yield from RECORD.iter_unpack(block)
+
+def calculate_winnings_external(
+        file: str, 
+        problem: Literal[1,2], 
+        chunk_size: int = 1_000_000
+        ) -> int:
+    '''
+    Streaming version of calculate_winnings() for files with more hands than
+    fit in memory (external merge sort). The hands are read in chunks of
+    'chunk_size' lines, each chunk is sorted by hand key and spilled to a 
+    temporary file, and the sorted files are k-way merged while the winnings
+    are added up, so memory only depends on 'chunk_size'. The line number is
+    part of the records so equal hands keep the order of the file.
+
+    Parameters
+    ----------
+    file : str
+        Path to the input file.
+    problem : Literal[1,2]
+        Problem
+    chunk_size : int
+        Number of hands sorted in memory at once.
+
+    Returns
+    -------
+    int
+        Winnings
+    '''
+    # Keys of the problem indexed by packed hand
+    keys = hand_table()[problem - 1]
+
+    with TemporaryDirectory() as directory:
+
+        # Sort and spill the chunks
+        chunks, records = [], []
+        for line_number, line in enumerate(read_lines(file)):
+            if not line:
+                continue
+            hand, bid = line.split()
+            records.append((int(keys[encode_hand(hand)]), line_number, int(bid)))
+            if len(records) == chunk_size:
+                chunks.append(spill_chunk(records, directory))
+                records = []
+        if records:
+            chunks.append(spill_chunk(records, directory))
+
+        # Merge the sorted chunks from the weakest to the strongest hand
+        winnings = 0
+        merged = heapq.merge(*[read_chunk(chunk) for chunk in chunks])
+        for rank, (_, _, bid) in enumerate(merged):
+            winnings += (rank + 1) * bid
 
     return winnings
 
 def main():
     '''Program process'''
-    hands_bids = read_input('Inputs/day7.txt')
+    hands_bids = read_input(input_path(7))
     print(calculate_winnings(hands_bids, 1))
     print(calculate_winnings(hands_bids, 2))
     
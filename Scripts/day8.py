@@ -5,9 +5,20 @@ https://adventofcode.com/2023/day/8
 '''
 
 import re
-from math import lcm
+from math import gcd, lcm
 
-def read_input(file: str) -> tuple[list[int], dict[str, tuple[str, str]]]:
+import numpy as np
+
+from inputs import input_path, read_lines
+from parse_cache import cached_parse
+from profiling import profiled
+
+# Steps swept by detect_cycles() between two searches of terminal nodes
+SWEEP_BLOCK = 1024
+
+@profiled('day8.parse')
+@cached_parse(version=1)
+def read_input(file: str | None) -> tuple[list[int], dict[str, tuple[str, str]]]:
     '''
     Reads the Advent of Code input file and returns the binary left/right
     instructions as 0s and 1s, respectively, and the network as a dictionary
@@ -15,8 +26,8 @@ def read_input(file: str) -> tuple[list[int], dict[str, tuple[str, str]]]:
 
     Parameters
     ----------
-    file : str
-        Path to the input file.
+    file : str | None
+        Path to the input file, '-' or None for stdin.
 
     Returns
     -------
@@ -26,28 +37,103 @@ def read_input(file: str) -> tuple[list[int], dict[str, tuple[str, str]]]:
         2) parent2children: dictionary with parent nodes as keys and their
         children nodes as values.
     '''
-    # Open file
-    with open(file, 'r') as handle:
-        # Read all lines in memory
-        lines = handle.readlines()
-        # Convert 'L' and 'R' to 0s and 1s
-        directions = [0 if i == 'L' else 1 for i in lines[0].strip() ]
-        # Make the parent2children dictionary by using re to find the triplets
-        parent2children = {}
-        for line in lines[2:]:
-            prevoius, left, right = re.findall(r'[A-Z]{3}', line)
+    # Read lines lazily
+    lines = read_lines(file)
+    # Convert 'L' and 'R' to 0s and 1s
+    directions = [0 if i == 'L' else 1 for i in next(lines)]
+    # Make the parent2children dictionary by using re to find the triplets
+    parent2children = {}
+    for line in lines:
+        if line:
+            prevoius, left, right = re.findall(r'\w+', line)
             parent2children[prevoius] = (left, right)
 
     return directions, parent2children
 
+def intern_network(
+        parent2children: dict[str, tuple[str, str]]
+        ) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Interns the nodes of the network into dense integer IDs (their position in
+    'parent2children') so the network can be stored in NumPy arrays and
+    navigated with integer lookups instead of string hashing.
+
+    Parameters
+    ----------
+    parent2children : dict[str, tuple[str, str]]
+        Dictionary with parent nodes as keys and their
+        children nodes as values -> {'AAA': ('ZZZ', 'ZZZ')}
+
+    Returns
+    -------
+    tuple[list[str], np.ndarray, np.ndarray, np.ndarray]
+        1) nodes: node names indexed by their ID.
+        2) left: ID of the left child of each node.
+        3) right: ID of the right child of each node.
+        4) terminal: whether each node ends with 'Z'.
+    '''
+    nodes = list(parent2children)
+    node2id = {node: id for id, node in enumerate(nodes)}
+
+    left = np.array([node2id[parent2children[node][0]] for node in nodes])
+    right = np.array([node2id[parent2children[node][1]] for node in nodes])
+    terminal = np.array([node.endswith('Z') for node in nodes], dtype=bool)
+
+    return nodes, left, right, terminal
+
+def macro_step(
+        directions: list[int], 
+        left: np.ndarray, 
+        right: np.ndarray, 
+        terminal: np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Precomputes, for every node at once, where it lands after one full pass of
+    'directions' and the first step of the pass at which it lands on a 
+    terminal node, so navigation can advance a whole pass with a single array
+    lookup.
+
+    Parameters
+    ----------
+    directions : list[int]
+        List of 0s (left) and 1s (right) representing the index
+        of which children node to follow next.
+    left : np.ndarray
+        ID of the left child of each node.
+    right : np.ndarray
+        ID of the right child of each node.
+    terminal : np.ndarray
+        Whether each node is a terminal node.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        1) landing: ID of the node reached after one pass from each node.
+        2) first_hit: number of steps of the pass until the first terminal
+        node is reached from each node (-1 if none is reached).
+    '''
+    # Walk every node at the same time
+    landing = np.arange(len(left))
+    first_hit = np.full(len(left), -1)
+
+    for step, direction in enumerate(directions):
+        landing = right[landing] if direction else left[landing]
+        # Record the first terminal node reached
+        first_hit[(first_hit < 0) & terminal[landing]] = step + 1
+
+    return landing, first_hit
+
+@profiled('day8.part1')
 def navigate_network1(
         directions: list[int], 
         parent2children: dict[str, tuple[str, str]]
         ) -> int:
     '''
-    Brute force network navigation method in which we transverse the tree of 
-    nodes represented by the 'parent2children' dictionary from node to node 
-    following the 'directions' indications until reaching the 'ZZZ' node.
+    Network navigation method in which we transverse the tree of nodes 
+    represented by the 'parent2children' dictionary following the 'directions'
+    indications until reaching the 'ZZZ' node. The network is interned into
+    integer arrays and navigated a whole pass of 'directions' at a time with
+    macro_step() until the pass in which 'ZZZ' is reached.
 
     Parameters
     ----------
@@ -63,42 +149,411 @@ def navigate_network1(
     int
         Number of steps required to reach ZZZ.
     '''
+    # Integer network with 'ZZZ' as only terminal node
+    nodes, left, right, _ = intern_network(parent2children)
+    terminal = np.array([node == 'ZZZ' for node in nodes], dtype=bool)
+    landing, first_hit = macro_step(directions, left, right, terminal)
 
     # Initialize starting variables
-    step, times = 0, 0
-    current_node = 'AAA'
+    times = 0
+    current_node = nodes.index('AAA')
+
+    # Take whole passes of directions until the one reaching 'ZZZ'. After as
+    # many passes as nodes without reaching it, the navigation is in a loop
+    while first_hit[current_node] < 0:
+        current_node = landing[current_node]
+        times += 1
+        if times > len(nodes):
+            raise ValueError('ZZZ cannot be reached from AAA')
+
+    # Amount of total steps 
+    return times*len(directions) + int(first_hit[current_node])
+
+def jump_tables(
+        directions: list[int],
+        left: np.ndarray,
+        right: np.ndarray,
+        max_steps: int = 10**18
+        ) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Precomputes binary lifting (doubling) tables to jump any number of steps
+    in O(log N). A state is the pair (node, instruction index), numbered
+    instruction index*nodes + node. The state table holds the state reached
+    after 2^k steps from every state, for 2^k up to the number of
+    instructions. The pass table holds the node reached after 2^k whole
+    passes of 'directions' from every node at instruction index 0, up to
+    'max_steps'.
+
+    Parameters
+    ----------
+    directions : list[int]
+        List of 0s (left) and 1s (right) representing the index
+        of which children node to follow next.
+    left : np.ndarray
+        ID of the left child of each node.
+    right : np.ndarray
+        ID of the right child of each node.
+    max_steps : int
+        Largest number of steps to be queried.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        1) state_jumps: state after 2^k steps, shape (levels, nodes*instructions).
+        2) pass_jumps: node after 2^k passes, shape (levels, nodes).
+    '''
+    n_nodes, n_directions = len(left), len(directions)
+
+    # One step: next instruction index and child of the current instruction
+    children = np.where(np.array(directions)[:, None] == 1, right, left)
+    next_index = (np.arange(n_directions) + 1) % n_directions
+    state_jumps = [(next_index[:, None]*n_nodes + children).ravel()]
+    for _ in range(n_directions.bit_length() - 1):
+        state_jumps.append(state_jumps[-1][state_jumps[-1]])
+
+    # One pass: the bits of the number of instructions, from every node
+    landing = np.arange(n_nodes)
+    for level, jumps in enumerate(state_jumps):
+        if n_directions >> level & 1:
+            landing = jumps[landing]
+    pass_jumps = [landing]
+    for _ in range((max_steps // n_directions).bit_length() - 1):
+        pass_jumps.append(pass_jumps[-1][pass_jumps[-1]])
+
+    return np.array(state_jumps), np.array(pass_jumps)
+
+def jump(
+        state_jumps: np.ndarray,
+        pass_jumps: np.ndarray,
+        nodes: np.ndarray,
+        indices: np.ndarray,
+        steps: np.ndarray
+        ) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Answers a batch of "where am I after N steps" queries with the tables of
+    jump_tables(). Each query takes the steps up to the end of the current
+    pass and then the whole passes and the remaining steps, every part
+    decomposed into powers of two.
+
+    Parameters
+    ----------
+    state_jumps : np.ndarray
+        State after 2^k steps.
+    pass_jumps : np.ndarray
+        Node after 2^k passes.
+    nodes : np.ndarray
+        ID of the starting node of each query.
+    indices : np.ndarray
+        Starting instruction index of each query.
+    steps : np.ndarray
+        Number of steps of each query.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Node ID and instruction index reached by each query.
+    '''
+    n_nodes = pass_jumps.shape[1]
+    n_directions = state_jumps.shape[1] // n_nodes
+    nodes, indices, steps = (np.asarray(x, dtype=np.int64) for x in (nodes, indices, steps))
+
+    def take(states: np.ndarray, counts: np.ndarray, table: np.ndarray) -> np.ndarray:
+        # Jump every state by its count, one power of two at a time
+        for level, jumps in enumerate(table):
+            states = np.where(counts >> level & 1, jumps[states], states)
+        return states
+
+    # Steps up to the end of the current pass
+    to_boundary = np.minimum(steps, (n_directions - indices) % n_directions)
+    states = take(indices*n_nodes + nodes, to_boundary, state_jumps)
+
+    # Whole passes from the start of the next pass, then the remaining steps
+    remaining = steps - to_boundary
+    if (remaining // n_directions >= 1 << len(pass_jumps)).any():
+        raise ValueError('More steps than the jump tables were built for')
+    boundary = remaining > 0
+    states[boundary] = take(states[boundary], remaining[boundary] // n_directions, pass_jumps)
+    states[boundary] = take(states[boundary], remaining[boundary] % n_directions, state_jumps)
+
+    return states % n_nodes, states // n_nodes
+
+def position_after(
+        directions: list[int],
+        parent2children: dict[str, tuple[str, str]],
+        queries: list[tuple[str, int]]
+        ) -> list[str]:
+    '''
+    Node reached from each starting node after a number of steps following
+    the instructions from the first one, for up to 10^18 steps.
+
+    Parameters
+    ----------
+    directions : list[int]
+        List of 0s (left) and 1s (right) representing the index
+        of which children node to follow next.
+    parent2children : dict[str, tuple[str, str]]
+        Dictionary with parent nodes as keys and their
+        children nodes as values -> {'AAA': ('ZZZ', 'ZZZ')}
+    queries : list[tuple[str, int]]
+        Starting node and number of steps of each query -> [('AAA', 10**18)]
+
+    Returns
+    -------
+    list[str]
+        Node reached by each query.
+    '''
+    nodes, left, right, _ = intern_network(parent2children)
+    node2id = {node: id for id, node in enumerate(nodes)}
+    state_jumps, pass_jumps = jump_tables(
+        directions, left, right, max((steps for _, steps in queries), default=0)
+    )
 
-    # While loop to iterate over eacht direction step and also each cycle of
-    # directions
-    while current_node != 'ZZZ':
-        
-        # Update current node
-        current_node = parent2children[current_node][directions[step]]
+    starts = [node2id[node] for node, _ in queries]
+    reached, _ = jump(
+        state_jumps, pass_jumps, starts, np.zeros(len(queries)), [steps for _, steps in queries]
+    )
+
+    return [nodes[id] for id in reached]
+
+def detect_cycle(
+        node: str, 
+        directions: list[int], 
+        parent2children: dict[str, tuple[str, str]]
+        ) -> tuple[list[int], list[int], int]:
+    '''
+    Navigates the network from a starting node until a state repeats. A state
+    is the pair (node, instruction index), so once one is seen again the walk
+    is periodic from the step where it was first seen. Every step at which a
+    node ending with 'Z' is reached is recorded, split into the hits before
+    the cycle (they happen only once) and the hits inside the cycle (they
+    happen again every period steps).
+
+    Parameters
+    ----------
+    node : str
+        Starting node.
+    directions : list[int]
+        List of 0s (left) and 1s (right) representing the index
+        of which children node to follow next.
+    parent2children : dict[str, tuple[str, str]]
+        Dictionary with parent nodes as keys and their
+        children nodes as values -> {'AAA': ('ZZZ', 'ZZZ')}
 
-        # One step taken
+    Returns
+    -------
+    tuple[list[int], list[int], int]
+        1) transient_hits: steps reaching an ending node before the cycle.
+        2) cyclic_hits: steps reaching an ending node in the first cycle.
+        3) period: number of steps of the cycle.
+    '''
+    # Step at which each (node, instruction index) state was first seen
+    state2step = {}
+    z_hits = []
+    step = 0
+
+    # Walk until a state repeats
+    while (node, step % len(directions)) not in state2step:
+        state2step[(node, step % len(directions))] = step
+        if node.endswith('Z'):
+            z_hits.append(step)
+        node = parent2children[node][directions[step % len(directions)]]
         step += 1
 
-        # One cycle of directions taken
-        if step == len(directions):
-            step = 0
-            times += 1
+    # The cycle starts where the repeated state was first seen
+    cycle_start = state2step[(node, step % len(directions))]
+    transient_hits = [hit for hit in z_hits if hit < cycle_start]
+    cyclic_hits = [hit for hit in z_hits if hit >= cycle_start]
 
-    # Amount of total steps 
-    return times*len(directions) + step
+    return transient_hits, cyclic_hits, step - cycle_start
+
+def detect_cycles(
+        starts: np.ndarray,
+        directions: list[int],
+        left: np.ndarray,
+        right: np.ndarray,
+        terminal: np.ndarray
+        ) -> list[tuple[list[int], list[int], int]]:
+    '''
+    Vectorized detect_cycle() for many starting nodes at once. The positions
+    of all the walkers are kept in an index vector and advanced together with
+    fancy indexing into the child arrays. The cycles are found at pass
+    boundaries, where the instruction index is 0 and the state is just the
+    node: Floyd's algorithm on the macro_step() landings gives the pass where
+    each cycle starts and its length in passes. A single sweep of every
+    walker over its transient and first cycle then records the steps at which
+    it is at a terminal node.
+
+    Parameters
+    ----------
+    starts : np.ndarray
+        ID of each starting node.
+    directions : list[int]
+        List of 0s (left) and 1s (right) representing the index
+        of which children node to follow next.
+    left : np.ndarray
+        ID of the left child of each node.
+    right : np.ndarray
+        ID of the right child of each node.
+    terminal : np.ndarray
+        Whether each node is a terminal node.
+
+    Returns
+    -------
+    list[tuple[list[int], list[int], int]]
+        For each starting node, as in detect_cycle():
+        1) transient_hits: steps reaching an ending node before the cycle.
+        2) cyclic_hits: steps reaching an ending node in the first cycle.
+        3) period: number of steps of the cycle.
+    '''
+    landing, _ = macro_step(directions, left, right, terminal)
+
+    # Floyd: move the hare two passes and the tortoise one until they meet
+    tortoise, hare = landing[starts], landing[landing[starts]]
+    moving = tortoise != hare
+    while moving.any():
+        tortoise[moving] = landing[tortoise[moving]]
+        hare[moving] = landing[landing[hare[moving]]]
+        moving = tortoise != hare
 
+    # Pass where each cycle starts: both meet again moving one pass at a time
+    tortoise = starts.copy()
+    cycle_start = np.zeros(len(starts), dtype=np.int64)
+    moving = tortoise != hare
+    while moving.any():
+        tortoise[moving] = landing[tortoise[moving]]
+        hare[moving] = landing[hare[moving]]
+        cycle_start[moving] += 1
+        moving = tortoise != hare
+
+    # Length of each cycle in passes
+    hare = landing[tortoise]
+    passes = np.ones(len(starts), dtype=np.int64)
+    moving = hare != tortoise
+    while moving.any():
+        hare[moving] = landing[hare[moving]]
+        passes[moving] += 1
+        moving = hare != tortoise
+
+    # Sweep every walker up to the end of its first cycle, gathering whether
+    # each one is at a terminal node in blocks of steps
+    cycle_start *= len(directions)
+    period = passes*len(directions)
+    cycle_stop = cycle_start + period
+    n_steps = int(cycle_stop.max())
+    children = (left, right)
+    position = starts.copy()
+    at_terminal = np.empty((min(n_steps, SWEEP_BLOCK), len(starts)), dtype=bool)
+    hit_walkers, hit_steps = [], []
+    for block_start in range(0, n_steps, SWEEP_BLOCK):
+        block_steps = min(SWEEP_BLOCK, n_steps - block_start)
+        for row in range(block_steps):
+            at_terminal[row] = terminal[position]
+            position = children[directions[(block_start + row) % len(directions)]][position]
+        steps, walkers = np.nonzero(at_terminal[:block_steps])
+        hit_walkers.append(walkers)
+        hit_steps.append(steps + block_start)
+
+    # Hits of each walker before the end of its first cycle, in step order
+    hit_walkers, hit_steps = np.concatenate(hit_walkers), np.concatenate(hit_steps)
+    valid = hit_steps < cycle_stop[hit_walkers]
+    order = np.argsort(hit_walkers[valid], kind='stable')
+    hit_walkers, hit_steps = hit_walkers[valid][order], hit_steps[valid][order]
+    bounds = np.searchsorted(hit_walkers, np.arange(len(starts) + 1))
+
+    cycles = []
+    for walker in range(len(starts)):
+        hits = hit_steps[bounds[walker]:bounds[walker + 1]].tolist()
+        start = int(cycle_start[walker])
+        cycles.append((
+            [hit for hit in hits if hit < start],
+            [hit for hit in hits if hit >= start],
+            int(period[walker])
+        ))
+
+    return cycles
+
+def crt(
+        congruence1: tuple[int, int], 
+        congruence2: tuple[int, int]
+        ) -> tuple[int, int] | None:
+    '''
+    Generalized Chinese remainder theorem: merges x = a1 (mod m1) and 
+    x = a2 (mod m2) into a single congruence x = a (mod lcm(m1, m2)). The 
+    moduli do not need to be coprime.
+
+    Parameters
+    ----------
+    congruence1 : tuple[int, int]
+        Remainder and modulus of the first congruence.
+    congruence2 : tuple[int, int]
+        Remainder and modulus of the second congruence.
+
+    Returns
+    -------
+    tuple[int, int] | None
+        Remainder and modulus of the merged congruence or None if there is no
+        solution.
+    '''
+    (a1, m1), (a2, m2) = congruence1, congruence2
+    g = gcd(m1, m2)
+
+    # Solutions only exist if both remainders agree modulo the gcd
+    if (a2 - a1) % g:
+        return None
+
+    # x = a1 + m1*k where (m1/g)*k = (a2 - a1)/g (mod m2/g)
+    k = (a2 - a1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+    modulus = lcm(m1, m2)
+
+    return (a1 + m1*k) % modulus, modulus
+
+def minimal_period(cyclic_hits: list[int], period: int) -> tuple[set[int], int]:
+    '''
+    The period of the (node, instruction index) states is often a multiple of
+    the true period of the ending node hits (e.g. a ring of nodes walked with
+    any instructions), which would multiply the combinations to check. The
+    hits are reduced to the smallest divisor of the period that keeps them 
+    invariant.
+
+    Parameters
+    ----------
+    cyclic_hits : list[int]
+        Steps reaching an ending node in the first cycle.
+    period : int
+        Number of steps of the cycle.
+
+    Returns
+    -------
+    tuple[set[int], int]
+        Remainders of the hits and their minimal period.
+    '''
+    hits = {hit % period for hit in cyclic_hits}
+
+    # Divisors of the period in increasing order
+    small = [q for q in range(1, int(period**0.5) + 1) if period % q == 0]
+    divisors = small + [period // q for q in reversed(small) if q*q != period]
+
+    for divisor in divisors:
+        if all((hit + divisor) % period in hits for hit in hits):
+            return {hit % divisor for hit in hits}, divisor
+
+@profiled('day8.part2')
 def navigate_network2(
         directions: list[int], 
-        parent2children: dict[str, tuple[str, str]]
+        parent2children: dict[str, tuple[str, str]],
+        vectorized: bool = False
         ) -> int:
     '''
-    For the second problem, brute force is not possible. The more intelligent
-    and efficient way of computing the number of navigating steps for all the
-    starting nodes (those ending with 'A') to reach a node ending in 'Z' takes
-    into account a clever pattern: navigating the network results in cycles of
-    a certain periodicity in which the ending node is reached in a fixed number
-    of steps specific for each starting point. Least common multiple is used to
-    calculate when all starting nodes will reach their corresponding ending
-    node.
+    For the second problem, brute force is not possible. Instead, the cycle of
+    each starting node (those ending with 'A') is detected with 
+    detect_cycle(), which gives the steps at which it reaches an ending node 
+    (those ending with 'Z'). Hits before the cycles are checked directly
+    against every starting node and hits inside the cycles, reduced to their
+    minimal period, are combined with the generalized Chinese remainder 
+    theorem, which reduces to the least common multiple when every node 
+    reaches its ending node exactly once per cycle at a multiple of the 
+    period. With many starting nodes, the vectorized mode detects all the
+    cycles together with detect_cycles().
 
     Parameters
     ----------
@@ -108,38 +563,83 @@ def navigate_network2(
     parent2children : dict[str, tuple[str, str]]
         Dictionary with parent nodes as keys and their
         children nodes as values -> {'AAA': ('ZZZ', 'ZZZ')}
+    vectorized : bool
+        Whether to advance all the starting nodes together.
 
     Returns
     -------
     int
         Number of steps for all starting nodes ('__A') to reach an ending node
         ('__Z') simultaneously.
+
+    Raises
+    ------
+    ValueError
+        If there are no starting nodes or they never are at ending nodes
+        simultaneously.
     '''
     
     # Search starting nodes, those that end with 'A'
     starting_nodes = [node for node in parent2children if node.endswith('A')]
-    # List with the number of direction steps to reach the converging node
-    n_steps = [0]*len(starting_nodes)
-
-    # Iterate over the 6 starting nodes
-    for step, node in enumerate(starting_nodes):
-        # Iterate over (concatenated) directions list
-        for direction in directions*100:
-            # Update current node
-            node = parent2children[node][direction]
-            # Add a step to the corresponding starting nodes
-            n_steps[step] += 1
-            # Detect node ending with 'Z'
-            if node.endswith('Z'):
-                break
-
-    return lcm(*n_steps)
+    if not starting_nodes:
+        raise ValueError('There are no starting nodes')
+
+    # Ending steps and period of each starting node
+    if vectorized:
+        nodes, left, right, terminal = intern_network(parent2children)
+        starts = np.flatnonzero([node.endswith('A') for node in nodes])
+        cycles = detect_cycles(starts, directions, left, right, terminal)
+    else:
+        cycles = [
+            detect_cycle(node, directions, parent2children) 
+            for node in starting_nodes
+        ]
+    # Hits inside the cycles as remainders of their minimal period
+    periodic = [
+        minimal_period(cyclic_hits, period) if cyclic_hits else (set(), 1)
+        for _, cyclic_hits, period in cycles
+    ]
+
+    def at_end(step: int, cycle, remainders, period) -> bool:
+        # Whether a starting node is at an ending node after a number of steps
+        transient_hits, cyclic_hits, _ = cycle
+        return step in transient_hits or (
+            bool(cyclic_hits) and step >= cyclic_hits[0] 
+            and step % period in remainders
+        )
+
+    # Hits before the cycles only happen once, so check them one by one
+    for step in sorted({hit for cycle in cycles for hit in cycle[0]}):
+        if all(at_end(step, cycle, *reduced) for cycle, reduced in zip(cycles, periodic)):
+            return step
+
+    # Merge the remainders of every starting node into remainders of the lcm
+    solutions, modulus = {0}, 1
+    for remainders, period in periodic:
+        merged = set()
+        for solution in solutions:
+            for remainder in remainders:
+                congruence = crt((solution, modulus), (remainder, period))
+                if congruence is not None:
+                    merged.add(congruence[0])
+        solutions, modulus = merged, lcm(modulus, period)
+
+    # No step where all the starting nodes are at an ending node
+    if not solutions:
+        raise ValueError('The starting nodes are never at ending nodes simultaneously')
+
+    # Smallest solution once every starting node is inside its cycle
+    first = max(cycle[1][0] for cycle in cycles)
+    return min(
+        solution + max(0, -(-(first - solution) // modulus))*modulus 
+        for solution in solutions
+    )
 
 def main():
     '''Program process'''
-    directions, parent2children = read_input('Inputs/day8.txt')
+    directions, parent2children = read_input(input_path(8))
     print(navigate_network1(directions, parent2children))
-    print(navigate_network2(directions, parent2children))
+    print(navigate_network2(directions, parent2children, vectorized=True))
     
 if __name__ ==  '__main__':
     main()
\ No newline at end of file
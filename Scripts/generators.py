@@ -0,0 +1,391 @@
+'''
+Seeded generators of synthetic inputs for every day.
+Each generator yields the lines of a valid input whose size grows with the
+'scale' argument (scale = 1 is roughly the size of the real input), so the
+solvers and the benchmark can be tested at 10x to 10,000x the size of the
+files in Inputs.
+
+Usage: python Scripts/generators.py DAY OUTPUT [--scale 100] [--seed 0]
+'''
+
+import argparse
+import random
+from itertools import count, product
+from string import ascii_uppercase
+from typing import Callable, Generator
+
+# English words of the digits (day 1)
+WORDS = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+# Names of the day 5 maps, in order
+MAP_NAMES = [
+    'seed-to-soil', 'soil-to-fertilizer', 'fertilizer-to-water',
+    'water-to-light', 'light-to-temperature', 'temperature-to-humidity',
+    'humidity-to-location'
+]
+
+def generate_day1(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Calibration lines made of random lowercase letters, digits and number
+    words. Every line has at least one digit so both exercises are solvable.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (1000 lines).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    for _ in range(max(1, int(1000*scale))):
+        tokens = [str(rng.randrange(1, 10))]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.3:
+                tokens.append(rng.choice(WORDS[1:]))
+            elif kind < 0.5:
+                tokens.append(str(rng.randrange(1, 10)))
+            else:
+                tokens.append(''.join(
+                    rng.choice('abcdefghijklmnopqrstuvwxyz')
+                    for _ in range(rng.randint(1, 4))
+                ))
+        rng.shuffle(tokens)
+        yield ''.join(tokens)
+
+def generate_day2(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Cube games with a few sets of red, green and blue cubes each.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (100 games).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    for game_id in range(1, max(1, int(100*scale)) + 1):
+        sets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            sets.append(', '.join(f'{rng.randint(1, 20)} {color}' for color in colors))
+        yield f'Game {game_id}: ' + '; '.join(sets)
+
+def generate_day3(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Engine schematics with numbers of 1 to 3 digits and symbols scattered over
+    a grid of periods. The number of cells grows with the scale.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (140 x 140 grid).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    side = max(3, int(140*scale**0.5))
+    for _ in range(side):
+        row = []
+        while len(row) < side:
+            kind = rng.random()
+            if kind < 0.06:
+                row += list(str(rng.randint(1, 999)))
+            elif kind < 0.08:
+                row.append(rng.choice('*#$%&+-/=@'))
+            row.append('.')
+        yield ''.join(row[:side])
+
+def generate_day4(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Scratchcards with 10 winning numbers and 25 elf numbers below 100. The
+    number of matches follows a geometric distribution with mean below 1, so
+    the total number of cards of part 2 stays bounded, and never goes past
+    the last card.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (about 200 cards).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    n_cards = max(1, int(200*scale))
+    width = len(str(n_cards))
+
+    for card in range(1, n_cards + 1):
+        # Number of matches
+        matches = 0
+        while matches < min(10, n_cards - card) and rng.random() < 0.4:
+            matches += 1
+
+        # Shared numbers first, then numbers only in one of the sides
+        numbers = rng.sample(range(1, 100), 35 - matches)
+        winning = numbers[:10]
+        elf = winning[:matches] + numbers[10:]
+        rng.shuffle(elf)
+
+        yield (
+            f'Card {card:>{width}}: '
+            + ' '.join(f'{number:>2}' for number in winning) + ' | '
+            + ' '.join(f'{number:>2}' for number in elf)
+        )
+
+def generate_day5(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Seed ranges and the seven maps. The source ranges of the parts of each map
+    never overlap, and there are gaps between them.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (10 seed ranges, about 30 parts per
+        map).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    limit = 2**32
+    n_ranges = max(1, int(10*scale))
+    n_parts = max(1, int(30*scale))
+
+    # Seed ranges as start, length pairs
+    seeds = []
+    for _ in range(n_ranges):
+        start = rng.randrange(limit)
+        seeds += [start, rng.randint(1, min(limit - start, 10**9))]
+    yield 'seeds: ' + ' '.join(map(str, seeds))
+
+    for name in MAP_NAMES:
+        yield ''
+        yield f'{name} map:'
+
+        # Consecutive cuts delimit the source ranges, skipping some as gaps
+        cuts = sorted(rng.sample(range(limit), 2*n_parts))
+        for source, stop in zip(cuts[::2], cuts[1::2]):
+            length = stop - source
+            yield f'{rng.randrange(limit - length)} {source} {length}'
+
+def generate_day6(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Race times and record distances. Every record is below the best possible
+    distance, so every race can be won.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (4 races).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    n_races = max(1, int(4*scale))
+    times = [rng.randint(2, 10**6) for _ in range(n_races)]
+    distances = [rng.randrange(time*time // 4) for time in times]
+    yield 'Time: ' + ' '.join(map(str, times))
+    yield 'Distance: ' + ' '.join(map(str, distances))
+
+def generate_day7(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Camel card hands with their bids.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (1000 hands).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    for _ in range(max(1, int(1000*scale))):
+        hand = ''.join(rng.choice('23456789TJQKA') for _ in range(5))
+        yield f'{hand} {rng.randint(1, 1000)}'
+
+def generate_day8(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    L/R instructions and a network of rings with guaranteed cycles. Every ring
+    begins with a starting node ('..A'), followed by positions of two nodes
+    and a last position with an ending node ('..Z'). The left and right
+    children of every node are the nodes of the next position, so any
+    instructions go around the ring, and the ending node leads back to the
+    second position. The first ring goes from 'AAA' to 'ZZZ'. Node names are
+    capital letters and grow longer once the three-letter names run out.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (6 rings, about 600 nodes).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    n_rings = max(1, int(6*scale))
+    yield ''.join(rng.choice('LR') for _ in range(rng.randint(200, 300)))
+    yield ''
+
+    # Unique names: the prefix identifies the ring for starting and ending
+    # nodes, while middle nodes end with 'B' to 'Y'. Prefixes of two letters
+    # come first, so small networks only have three-letter names
+    prefixes = (
+        ''.join(letters) for length in count(2)
+        for letters in product(ascii_uppercase, repeat=length)
+        if length > 2 or ''.join(letters) not in ('AA', 'ZZ')
+    )
+    names = (
+        ''.join(letters) + last for length in count(2)
+        for last in ascii_uppercase[1:-1]
+        for letters in product(ascii_uppercase, repeat=length)
+    )
+    lines = []
+
+    for ring in range(n_rings):
+        length = rng.randint(20, 80)
+        middle = [[next(names), next(names)] for _ in range(length)]
+        prefix = 'AA' if ring == 0 else next(prefixes)
+        start = prefix + 'A'
+        end = 'ZZZ' if ring == 0 else prefix + 'Z'
+        positions = [[start]] + middle + [[end]]
+
+        # Children are the nodes of the next position (the second after the last)
+        for position, nodes in enumerate(positions):
+            if position + 1 < len(positions):
+                children = positions[position + 1]
+            else:
+                children = positions[1]
+            left, right = children if len(children) == 2 else children*2
+            for node in nodes:
+                lines.append(f'{node} = ({left}, {right})')
+
+    rng.shuffle(lines)
+    yield from lines
+
+def generate_day11(scale: float, rng: random.Random) -> Generator[str, None, None]:
+    '''
+    Sparse galaxy grids in which about 2 % of the cells are galaxies. A fixed
+    5 % of the rows and columns are left empty, so the grids keep expanding at
+    every scale. The number of cells grows with the scale.
+
+    Parameters
+    ----------
+    scale : float
+        Size relative to the real input (140 x 140 grid).
+    rng : random.Random
+        Seeded random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    side = max(1, int(140*scale**0.5))
+
+    # Rows and columns without galaxies
+    empty_rows = set(rng.sample(range(side), max(1, side // 20)))
+    empty_columns = set(rng.sample(range(side), max(1, side // 20)))
+
+    for row in range(side):
+        yield ''.join(
+            '#' if row not in empty_rows and column not in empty_columns and rng.random() < 0.02
+            else '.'
+            for column in range(side)
+        )
+
+# Generator of each day
+GENERATORS: dict[int, Callable[[float, random.Random], Generator[str, None, None]]] = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+    11: generate_day11,
+}
+
+def generate(day: int, scale: float = 1, seed: int = 0) -> Generator[str, None, None]:
+    '''
+    Builds a generator yielding each line of a synthetic input of a day.
+
+    Parameters
+    ----------
+    day : int
+        Advent of Code day.
+    scale : float
+        Size relative to the real input.
+    seed : int
+        Seed of the random number generator.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input.
+    '''
+    yield from GENERATORS[day](scale, random.Random(seed))
+
+def write_input(day: int, file: str, scale: float = 1, seed: int = 0):
+    '''
+    Writes a synthetic input of a day to a file, line by line.
+
+    Parameters
+    ----------
+    day : int
+        Advent of Code day.
+    file : str
+        Path to the output file.
+    scale : float
+        Size relative to the real input.
+    seed : int
+        Seed of the random number generator.
+    '''
+    with open(file, 'w') as handle:
+        for line in generate(day, scale, seed):
+            handle.write(line + '\n')
+
+def main():
+    '''Program process'''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('day', type=int, choices=list(GENERATORS))
+    parser.add_argument('output')
+    parser.add_argument('--scale', type=float, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    write_input(args.day, args.output, args.scale, args.seed)
+
+if __name__ ==  '__main__':
+    main()
@@ -0,0 +1,183 @@
+'''
+Vectorized engine for character grid inputs.
+Grids are loaded as uint8 arrays of character codes straight from the
+memory-mapped file, and adjacency and digit runs are computed with whole-array
+operations instead of per-cell Python loops.
+'''
+
+import numpy as np
+
+from inputs import map_input
+
+# Offsets of the 8 neighbours of a cell
+NEIGHBOURS = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1)
+]
+
+def grid_layout(buffer: np.ndarray) -> tuple[int, int, int]:
+    '''
+    Finds the layout of a grid file viewed as a uint8 buffer from the position
+    of its first new line character. Every line is assumed to have the same
+    width.
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        Bytes of the grid file.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        Number of rows, number of columns and distance in bytes between the
+        starts of two consecutive rows.
+    '''
+    # Search the first new line in growing prefixes of the buffer
+    size = 1024
+    newlines = np.flatnonzero(buffer[:size] == ord('\n'))
+    while not len(newlines) and size < len(buffer):
+        size *= 2
+        newlines = np.flatnonzero(buffer[:size] == ord('\n'))
+    newline = int(newlines[0]) if len(newlines) else len(buffer)
+
+    # Windows line endings are not part of the grid
+    width = newline - int(newline > 0 and buffer[newline - 1] == ord('\r'))
+    stride = newline + 1
+
+    # The last line may not end with a new line character
+    n_rows = -(-len(buffer) // stride)
+
+    return n_rows, width, stride
+
+def read_grid(file: str | None) -> np.ndarray:
+    '''
+    Loads a character grid as a 2D uint8 array of character codes. For plain
+    files the array is a view of the memory-mapped file, unless the last line
+    lacks its new line character.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    np.ndarray
+        Grid of character codes, shape (rows, columns).
+    '''
+    buffer = np.frombuffer(map_input(file), dtype=np.uint8)
+    n_rows, width, stride = grid_layout(buffer)
+
+    # Pad the last line if it does not end with a new line character
+    if len(buffer) % stride:
+        padding = np.zeros(stride - len(buffer) % stride, dtype=np.uint8)
+        buffer = np.concatenate((buffer, padding))
+
+    return buffer.reshape(n_rows, stride)[:, :width]
+
+def shift(mask: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    '''
+    Shifts a 2D mask so that every cell takes the value of the cell at
+    (row - rows, col - cols), filling with False what comes from outside.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Boolean mask.
+    rows : int
+        Rows to shift down (negative for up).
+    cols : int
+        Columns to shift right (negative for left).
+
+    Returns
+    -------
+    np.ndarray
+        Shifted mask.
+    '''
+    shifted = np.zeros_like(mask)
+    n_rows, n_cols = mask.shape
+    shifted[
+        max(rows, 0) : n_rows + min(rows, 0), max(cols, 0) : n_cols + min(cols, 0)
+    ] = mask[
+        max(-rows, 0) : n_rows + min(-rows, 0), max(-cols, 0) : n_cols + min(-cols, 0)
+    ]
+    return shifted
+
+def adjacent(mask: np.ndarray) -> np.ndarray:
+    '''
+    Marks the cells that have any of their 8 neighbours in a mask, as the OR of
+    the mask shifted in the 8 directions.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Boolean mask.
+
+    Returns
+    -------
+    np.ndarray
+        Cells 8-adjacent to the mask.
+    '''
+    result = np.zeros_like(mask)
+    for rows, cols in NEIGHBOURS:
+        result |= shift(mask, rows, cols)
+    return result
+
+def label_runs(mask: np.ndarray) -> np.ndarray:
+    '''
+    Labels the horizontal runs of consecutive True cells of a mask with 1, 2,
+    3... in reading order, leaving 0 elsewhere. Runs never continue from the
+    end of a row to the start of the next one.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Boolean mask.
+
+    Returns
+    -------
+    np.ndarray
+        Run label of each cell.
+    '''
+    previous = np.zeros_like(mask)
+    previous[:, 1:] = mask[:, :-1]
+    starts = mask & ~previous
+    return np.cumsum(starts).reshape(mask.shape) * mask
+
+def run_numbers(grid: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    '''
+    Reads the digit runs of a grid as numbers. The digit of every cell is
+    weighted by 10 to the power of the cells left until the end of its run, and
+    the weighted digits are added up per run.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Grid of character codes.
+    labels : np.ndarray
+        Run label of each cell (0 for non-digits), from label_runs().
+
+    Returns
+    -------
+    np.ndarray
+        Number of each run, indexed by label (index 0 is unused).
+    '''
+    flat_labels = labels.ravel()
+    cells = np.flatnonzero(flat_labels)
+    runs = flat_labels[cells]
+
+    # Labels grow in reading order, so the cells of every run are contiguous
+    lengths = np.bincount(runs, minlength=1)
+    run_starts = np.flatnonzero(np.diff(runs, prepend=0))
+
+    # Position of each digit counted from the end of its run
+    index_in_run = np.arange(len(cells)) - run_starts[runs - 1]
+    position = lengths[runs] - 1 - index_in_run
+
+    # Add up the weighted digits of every run
+    digits = grid.ravel()[cells].astype(np.int64) - ord('0')
+    numbers = np.zeros(len(lengths), dtype=np.int64)
+    np.add.at(numbers, runs, digits * 10**position)
+
+    return numbers
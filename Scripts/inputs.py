@@ -0,0 +1,151 @@
+'''
+Shared input layer for every day.
+Inputs are read lazily from a path or from stdin ('-' or None), with plain,
+gzip (.gz) and zstandard (.zst) files supported. Plain files can also be
+memory-mapped. Numbers too long for the default limit of int <-> str
+conversions are handled inside unlimited_digits().
+'''
+
+import gzip
+import io
+import mmap
+import os
+import sys
+from contextlib import contextmanager
+from typing import IO, Generator
+
+# Size of the read buffer
+BUFFER_SIZE = 1 << 20
+
+def input_path(day: int) -> str:
+    '''
+    Path to the input of a day: the first command line argument if given
+    (use '-' for stdin) or the default file in the Inputs folder.
+
+    Parameters
+    ----------
+    day : int
+        Advent of Code day.
+
+    Returns
+    -------
+    str
+        Path to the input file.
+    '''
+    return sys.argv[1] if len(sys.argv) > 1 else f'Inputs/day{day}.txt'
+
+@contextmanager
+def open_input(
+        file: str | None = None,
+        binary: bool = False
+        ) -> Generator[IO, None, None]:
+    '''
+    Opens an input with buffering, decompressing it on the fly if its
+    extension is .gz or .zst. stdin is used if no path or '-' is given, and is
+    left open on exit.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+    binary : bool
+        Whether to open the input in binary mode instead of text mode.
+
+    Yields
+    ------
+    Generator[IO, None, None]
+        File object of the input.
+    '''
+    # stdin
+    if file in (None, '-'):
+        yield sys.stdin.buffer if binary else sys.stdin
+        return
+
+    # Compressed files
+    if file.endswith('.gz'):
+        handle = gzip.open(file, 'rb' if binary else 'rt')
+    elif file.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError(
+                'zstandard is required to read .zst inputs'
+            ) from error
+        handle = zstandard.ZstdDecompressor().stream_reader(
+            open(file, 'rb', buffering=BUFFER_SIZE)
+        )
+        if not binary:
+            handle = io.TextIOWrapper(handle)
+
+    # Plain files
+    else:
+        handle = open(file, 'rb' if binary else 'r', buffering=BUFFER_SIZE)
+
+    with handle:
+        yield handle
+
+def read_lines(file: str | None = None) -> Generator[str, None, None]:
+    '''
+    Builds a generator yielding each line of the Advent of Code input file,
+    reading it lazily so only one line is in memory at a time.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the input file.
+    '''
+    with open_input(file) as handle:
+        for line in handle:
+            yield line.strip()
+
+def map_input(file: str | None = None) -> mmap.mmap | bytes:
+    '''
+    Memory-maps a plain input file so its bytes can be viewed without copies.
+    Inputs that cannot be mapped (stdin, compressed or empty files) are read
+    into memory instead.
+
+    Parameters
+    ----------
+    file : str | None
+        Path to the input file, '-' or None for stdin.
+
+    Returns
+    -------
+    mmap.mmap | bytes
+        Bytes of the input.
+    '''
+    # Plain, non-empty files are mapped
+    if (
+        file not in (None, '-')
+        and not file.endswith(('.gz', '.zst'))
+        and os.path.getsize(file) > 0
+    ):
+        with open(file, 'rb') as handle:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with open_input(file, binary=True) as handle:
+        return handle.read()
+
+@contextmanager
+def unlimited_digits() -> Generator[None, None, None]:
+    '''
+    Lifts the limit of digits of int <-> str conversions inside the context
+    and restores it on exit. Some answers of large generated inputs (day 6)
+    have more digits than the default limit.
+
+    Yields
+    ------
+    Generator[None, None, None]
+        Nothing, the conversions run inside the context.
+    '''
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        yield
+    finally:
+        sys.set_int_max_str_digits(limit)
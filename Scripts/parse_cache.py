@@ -0,0 +1,221 @@
+'''
+Persistent on-disk cache of parsed inputs and precomputed tables.
+Parsed structures are pickled under a key made of the content hash of the
+input file, the parser and its version, so repeated solves of the same input
+skip parsing. Tables that do not depend on the input are pickled once per
+builder version. The cache has a size cap and evicts the least recently used
+entries first.
+
+Configuration (environment variables):
+- AOC_CACHE: set to 0 to disable the cache.
+- AOC_CACHE_DIR: cache folder (.aoc_cache by default).
+- AOC_CACHE_MAX_BYTES: size cap of the cache (256 MiB by default).
+'''
+
+import hashlib
+import os
+import pickle
+import time
+from functools import wraps
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, TypeVar
+
+# Parsed input or table
+T = TypeVar('T')
+
+# Suffix of the entries being written, and age after which they are left
+# over from a crashed writer
+TEMPORARY_SUFFIX = '.tmp'
+STALE_SECONDS = 3600
+
+def file_hash(file: str) -> str:
+    '''
+    Hashes the content of a file.
+
+    Parameters
+    ----------
+    file : str
+        Path to the file.
+
+    Returns
+    -------
+    str
+        Hexadecimal BLAKE2b digest of the content.
+    '''
+    with open(file, 'rb') as handle:
+        return hashlib.file_digest(handle, 'blake2b').hexdigest()
+
+def evict(directory: str, max_bytes: int):
+    '''
+    Deletes the least recently used entries (oldest modification time, which
+    is refreshed on every hit) until the cache fits in 'max_bytes', and the
+    temporary files left behind by writers that crashed. Parallel workers
+    share the cache, so entries may vanish while they are evicted.
+
+    Parameters
+    ----------
+    directory : str
+        Cache folder.
+    max_bytes : int
+        Size cap of the cache.
+    '''
+    entries = []
+    now = time.time()
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.endswith('.pickle'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith(TEMPORARY_SUFFIX):
+                if now - entry.stat().st_mtime > STALE_SECONDS:
+                    os.remove(entry.path)
+        except FileNotFoundError:
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+def entry_path(function: Callable, version: int, key: str) -> str:
+    '''
+    Path of the cache entry of a function, named after its module file (the
+    module is '__main__' when the day is run as a script), its qualified
+    name, its version and a key.
+
+    Parameters
+    ----------
+    function : Callable
+        Cached function.
+    version : int
+        Version of the function.
+    key : str
+        Key of the entry within the function -> content hash of the input.
+
+    Returns
+    -------
+    str
+        Path to the entry.
+    '''
+    directory = os.environ.get('AOC_CACHE_DIR', '.aoc_cache')
+    module = os.path.splitext(os.path.basename(function.__code__.co_filename))[0]
+    name = f'{module}.{function.__qualname__}.v{version}'
+    return os.path.join(directory, f'{name}.{key}.pickle')
+
+def load_entry(path: str) -> tuple[bool, Any]:
+    '''
+    Loads a cache entry, refreshing it for the LRU eviction on a hit.
+
+    Parameters
+    ----------
+    path : str
+        Path to the entry.
+
+    Returns
+    -------
+    tuple[bool, Any]
+        Whether the entry was found and its value (None on a miss).
+    '''
+    try:
+        with open(path, 'rb') as handle:
+            value = pickle.load(handle)
+        os.utime(path)
+        return True, value
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return False, None
+
+def store_entry(path: str, value: Any):
+    '''
+    Stores a cache entry atomically and evicts old entries if the cache goes
+    over its size cap.
+
+    Parameters
+    ----------
+    path : str
+        Path to the entry.
+    value : Any
+        Value to pickle.
+    '''
+    directory = os.path.dirname(path)
+    max_bytes = int(os.environ.get('AOC_CACHE_MAX_BYTES', 256 << 20))
+
+    os.makedirs(directory, exist_ok=True)
+    with NamedTemporaryFile('wb', dir=directory, suffix=TEMPORARY_SUFFIX, delete=False) as handle:
+        pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(handle.name, path)
+    evict(directory, max_bytes)
+
+def cached_parse(version: int = 1) -> Callable[[Callable[[str], T]], Callable[[str], T]]:
+    '''
+    Decorator caching the result of a parser taking the path to an input file
+    as its first argument. Bumping 'version' invalidates the entries of older
+    parser versions. stdin inputs ('-' or None) are never cached.
+
+    Parameters
+    ----------
+    version : int
+        Version of the parser.
+
+    Returns
+    -------
+    Callable[[Callable[[str], T]], Callable[[str], T]]
+        Decorator.
+    '''
+    def decorator(parser: Callable[[str], T]) -> Callable[[str], T]:
+
+        @wraps(parser)
+        def wrapper(file: str | None, *args, **kwargs) -> T:
+            if file in (None, '-') or args or kwargs or os.environ.get('AOC_CACHE') == '0':
+                return parser(file, *args, **kwargs)
+
+            path = entry_path(parser, version, file_hash(file))
+            hit, parsed = load_entry(path)
+            if not hit:
+                parsed = parser(file)
+                store_entry(path, parsed)
+
+            return parsed
+
+        return wrapper
+
+    return decorator
+
+def cached_table(version: int = 1) -> Callable[[Callable[[], T]], Callable[[], T]]:
+    '''
+    Decorator caching the result of a function without arguments that builds
+    a precomputed table, so it is built once instead of in every process.
+    Bumping 'version' invalidates the entries of older builders.
+
+    Parameters
+    ----------
+    version : int
+        Version of the table builder.
+
+    Returns
+    -------
+    Callable[[Callable[[], T]], Callable[[], T]]
+        Decorator.
+    '''
+    def decorator(builder: Callable[[], T]) -> Callable[[], T]:
+
+        @wraps(builder)
+        def wrapper() -> T:
+            if os.environ.get('AOC_CACHE') == '0':
+                return builder()
+
+            path = entry_path(builder, version, 'table')
+            hit, table = load_entry(path)
+            if not hit:
+                table = builder()
+                store_entry(path, table)
+
+            return table
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,202 @@
+'''
+Opt-in instrumentation of the parse and solve phases of every day.
+When enabled, phases are timed, calls to the hot helpers of the days are
+counted and every phase can be dumped as a cProfile file to inspect with
+pstats. When disabled, counted helpers are left undecorated and phases are
+a null context, so the instrumentation costs next to nothing.
+
+Phases are the parse and solve blocks of run.py and the entry points of the
+days decorated with profiled(), so scripts run directly are profiled too. A
+phase entered inside another one belongs to the outer phase and is neither
+timed again nor profiled with a nested cProfile.
+
+Configuration (environment variables, read when this module is imported):
+- AOC_PROFILE: set to 1 to enable the instrumentation (run.py --profile).
+- AOC_PROFILE_DIR: folder for the cProfile dumps of each phase, one
+  <phase>.prof file per phase (run.py --profile-dir).
+'''
+
+import atexit
+import cProfile
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, ContextManager, Generator, TypeVar
+
+# Instrumented function
+F = TypeVar('F', bound=Callable[..., Any])
+
+ENABLED = os.environ.get('AOC_PROFILE', '0') not in ('', '0')
+PROFILE_DIR = os.environ.get('AOC_PROFILE_DIR')
+
+# Total seconds spent in each phase and number of calls of each helper
+TIMERS = defaultdict(float)
+COUNTS = Counter()
+
+# Names of the phases being run, the outermost one first
+ACTIVE = []
+
+def counted(function: F) -> F:
+    '''
+    Decorator counting the calls of a hot helper under its qualified name.
+    The function is returned as is when the instrumentation is disabled.
+
+    Parameters
+    ----------
+    function : F
+        Helper to count.
+
+    Returns
+    -------
+    F
+        Counting wrapper, or the helper itself if disabled.
+    '''
+    if not ENABLED:
+        return function
+
+    # Named after the module file, since it is '__main__' in scripts
+    module = os.path.splitext(os.path.basename(function.__code__.co_filename))[0]
+    name = f'{module}.{function.__qualname__}'
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        COUNTS[name] += 1
+        return function(*args, **kwargs)
+
+    return wrapper
+
+@contextmanager
+def timed_phase(name: str) -> Generator[None, None, None]:
+    '''
+    Times a phase and adds its duration to TIMERS, profiling it with cProfile
+    if PROFILE_DIR is set. Phases nested in a running one are not measured.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase -> 'day5.parse'
+
+    Yields
+    ------
+    Generator[None, None, None]
+        Nothing, the phase runs inside the context.
+    '''
+    if ACTIVE:
+        yield
+        return
+
+    profiler = cProfile.Profile() if PROFILE_DIR else None
+    ACTIVE.append(name)
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        TIMERS[name] += time.perf_counter() - start
+        ACTIVE.pop()
+        if profiler:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(PROFILE_DIR, f'{name}.prof'))
+
+def phase(name: str) -> ContextManager[None]:
+    '''
+    Context manager of a parse or solve phase: timed_phase() if the
+    instrumentation is enabled and a null context otherwise.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase -> 'day5.part1'
+
+    Returns
+    -------
+    ContextManager[None]
+        Context to run the phase in.
+    '''
+    return timed_phase(name) if ENABLED else nullcontext()
+
+def profiled(name: str) -> Callable[[F], F]:
+    '''
+    Decorator running every call of a function as a phase. Meant for the
+    parse and solve entry points of the days, not for generators, whose body
+    runs after the call returns.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase.
+
+    Returns
+    -------
+    Callable[[F], F]
+        Decorator, which returns the function as is if disabled.
+    '''
+    def decorator(function: F) -> F:
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with timed_phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+def snapshot(clear: bool = False) -> dict[str, dict[str, float]]:
+    '''
+    Collects the timers and call counts recorded in this process, so worker
+    processes can send them back to the parent.
+
+    Parameters
+    ----------
+    clear : bool
+        Whether to reset the timers and counts after collecting them.
+
+    Returns
+    -------
+    dict[str, dict[str, float]]
+        Seconds per phase ('timers') and calls per helper ('counts').
+    '''
+    recorded = {'timers': dict(TIMERS), 'counts': dict(COUNTS)}
+    if clear:
+        TIMERS.clear()
+        COUNTS.clear()
+    return recorded
+
+def report(snapshots: list[dict[str, dict[str, float]]] | None = None):
+    '''
+    Prints the timers and call counts to stderr, merging the snapshots of
+    other processes if given.
+
+    Parameters
+    ----------
+    snapshots : list[dict[str, dict[str, float]]] | None
+        Snapshots of worker processes (this process by default).
+    '''
+    timers, counts = defaultdict(float), Counter()
+    for recorded in snapshots or [snapshot()]:
+        for name, seconds in recorded['timers'].items():
+            timers[name] += seconds
+        counts.update(recorded['counts'])
+
+    for name, seconds in timers.items():
+        print(f'phase {name:<40} {seconds*1000:12.3f} ms', file=sys.stderr)
+    for name, calls in counts.most_common():
+        print(f'calls {name:<40} {calls:12d}', file=sys.stderr)
+
+def report_at_exit():
+    '''Reports this process at exit if anything was recorded.'''
+    if TIMERS or COUNTS:
+        report()
+
+# Scripts run directly report their own process at exit
+if ENABLED:
+    atexit.register(report_at_exit)
@@ -0,0 +1,216 @@
+'''
+Unified runner for every day.
+The selected days are solved in parallel by a process pool, so a full run
+takes roughly as long as the slowest day. Each day module, and its heavy
+dependencies like NumPy, is only imported by the worker solving that day.
+With --profile the phases and hot helpers of every day are instrumented (see
+profiling.py) and reported to stderr.
+
+Usage: python Scripts/run.py [--days 1 5] [--parts 1 2] [--format json]
+       [--profile] [--profile-dir profiles]
+'''
+
+import argparse
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import prod
+from typing import Any
+
+from inputs import unlimited_digits
+
+# Parse phase and solve function of each part of each day. The parse function
+# takes the day module and the input path, and the solve functions take the
+# day module and the parsed input
+SOLVERS = {
+    1: (
+        lambda day, file: list(day.read_input(file)),
+        {
+            1: lambda day, lines: day.calibrate_lines(lines)[0],
+            2: lambda day, lines: day.calibrate_lines(lines)[1],
+        }
+    ),
+    2: (
+        lambda day, file: list(day.read_input(file)),
+        {
+            1: lambda day, lines: day.game_sums(lines)[0],
+            2: lambda day, lines: day.game_sums(lines)[1],
+        }
+    ),
+    3: (
+        lambda day, file: day.read_input(file),
+        {
+            1: lambda day, schematic: day.sum_part_numbers(schematic),
+            2: lambda day, schematic: day.sum_gear_ratios(schematic),
+        }
+    ),
+    4: (
+        lambda day, file: list(day.read_input(file)),
+        {
+            1: lambda day, lines: day.total_points(map(day.count_matches, lines))[0],
+            2: lambda day, lines: day.total_points(map(day.count_matches, lines))[1],
+        }
+    ),
+    5: (
+        lambda day, file: day.read_input(file),
+        {
+            1: lambda day, parsed: day.solve1(parsed[0], parsed[2]),
+            2: lambda day, parsed: day.solve2(parsed[1], parsed[2]),
+        }
+    ),
+    6: (
+        lambda day, file: day.read_input(file),
+        {
+            1: lambda day, races: prod(day.count_wins_batch(*races).tolist()),
+            2: lambda day, races: day.count_wins(*map(day.concatenate, races)),
+        }
+    ),
+    7: (
+        lambda day, file: day.read_input(file),
+        {
+            1: lambda day, hands_bids: day.calculate_winnings(hands_bids, 1),
+            2: lambda day, hands_bids: day.calculate_winnings(hands_bids, 2),
+        }
+    ),
+    8: (
+        lambda day, file: day.read_input(file),
+        {
+            1: lambda day, parsed: day.navigate_network1(*parsed),
+            2: lambda day, parsed: day.navigate_network2(*parsed, vectorized=True),
+        }
+    ),
+    11: (
+        lambda day, file: day.expansion_index(*day.read_galaxies(file)),
+        {
+            1: lambda day, index: day.total_distance(index, 2),
+            2: lambda day, index: day.total_distance(index, 1_000_000),
+        }
+    ),
+}
+
+def solve_day(day: int, parts: list[int], file: str) -> dict[str, Any]:
+    '''
+    Imports the module of a day and solves the selected parts, timing the
+    import, the parse phase and each part. Runs in the worker processes.
+    The profiling module is imported here too, so it reads the configuration
+    set by main() before the workers start.
+
+    Parameters
+    ----------
+    day : int
+        Advent of Code day.
+    parts : list[int]
+        Parts to solve.
+    file : str
+        Path to the input file.
+
+    Returns
+    -------
+    dict[str, Any]
+        Answers of each part, timings in seconds and profiling snapshot.
+    '''
+    from profiling import phase, snapshot
+
+    start = time.perf_counter()
+    module = importlib.import_module(f'day{day}')
+    parse, solvers = SOLVERS[day]
+    timings = {'import': time.perf_counter() - start}
+
+    # Parse phase
+    start = time.perf_counter()
+    with phase(f'day{day}.parse'):
+        parsed = parse(module, file)
+    timings['parse'] = time.perf_counter() - start
+
+    # Solve phase of each part
+    answers = {}
+    for part in parts:
+        start = time.perf_counter()
+        with phase(f'day{day}.part{part}'):
+            answers[part] = solvers[part](module, parsed)
+        timings[f'part{part}'] = time.perf_counter() - start
+
+    return {
+        'day': day,
+        'answers': answers,
+        'timings': timings,
+        'profile': snapshot(clear=True)
+    }
+
+def run(
+        days: list[int],
+        parts: list[int],
+        inputs: str = 'Inputs',
+        processes: int | None = None
+        ) -> list[dict[str, Any]]:
+    '''
+    Solves the selected days in parallel with a process pool (or in this
+    process if 'processes' is 1).
+
+    Parameters
+    ----------
+    days : list[int]
+        Advent of Code days.
+    parts : list[int]
+        Parts to solve for each day.
+    inputs : str
+        Folder with the dayN.txt input files.
+    processes : int | None
+        Number of worker processes (one per day by default).
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Answers and timings of each day, in the order of 'days'.
+    '''
+    files = [os.path.join(inputs, f'day{day}.txt') for day in days]
+    processes = processes or min(len(days), os.cpu_count() or 1)
+
+    if processes == 1:
+        return [solve_day(day, parts, file) for day, file in zip(days, files)]
+
+    with ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(solve_day, days, [parts]*len(days), files))
+
+def main():
+    '''Program process'''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--days', type=int, nargs='+', default=list(SOLVERS))
+    parser.add_argument('--parts', type=int, nargs='+', default=[1, 2], choices=[1, 2])
+    parser.add_argument('--inputs', default='Inputs', help='folder with dayN.txt')
+    parser.add_argument('--processes', type=int, help='1 to run in this process')
+    parser.add_argument('--format', default='table', choices=['table', 'json'])
+    parser.add_argument('--profile', action='store_true', help='time phases and count helper calls')
+    parser.add_argument('--profile-dir', help='folder for cProfile dumps of each phase')
+    args = parser.parse_args()
+
+    # Configure the instrumentation before any day module is imported
+    if args.profile or args.profile_dir:
+        os.environ['AOC_PROFILE'] = '1'
+    if args.profile_dir:
+        os.environ['AOC_PROFILE_DIR'] = args.profile_dir
+
+    start = time.perf_counter()
+    results = run(args.days, args.parts, args.inputs, args.processes)
+    total = time.perf_counter() - start
+
+    # Answers of large inputs can exceed the digit limit of int -> str
+    with unlimited_digits():
+        if args.format == 'json':
+            print(json.dumps({'results': results, 'total': total}, indent=2))
+            return
+
+        for result in results:
+            for part, answer in result['answers'].items():
+                timing = result['timings'][f'part{part}']
+                print(f'day{result["day"]:<3} part{part} {answer!s:>24} {timing*1000:10.3f} ms')
+    print(f'total {total*1000:.3f} ms')
+
+    if os.environ.get('AOC_PROFILE', '0') not in ('', '0'):
+        from profiling import report
+        report([result['profile'] for result in results])
+
+if __name__ ==  '__main__':
+    main()
@@ -0,0 +1,137 @@
+'''
+Multi-core line sharding for the line-oriented days.
+The input file is split into byte ranges aligned on new lines and each range
+(shard) is reduced by a process of a pool with the per-line logic of the day.
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Generator, Iterator, TypeVar
+
+# Partial result of a shard
+T = TypeVar('T')
+
+def shard_file(file: str, n_shards: int) -> list[tuple[int, int]]:
+    '''
+    Splits a file into at most 'n_shards' [start, stop) byte ranges of similar
+    size. Every boundary is moved forward to the start of the next line, so no
+    line is split between two shards.
+
+    Parameters
+    ----------
+    file : str
+        Path to the input file.
+    n_shards : int
+        Number of shards wanted.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Byte ranges of the shards, in file order.
+    '''
+    size = os.path.getsize(file)
+    boundaries = [0]
+
+    with open(file, 'rb') as handle:
+        for shard in range(1, n_shards):
+            # Skip the rest of the line the tentative boundary falls in
+            handle.seek(max(size*shard//n_shards - 1, boundaries[-1]))
+            handle.readline()
+            boundaries.append(min(handle.tell(), size))
+    boundaries.append(size)
+
+    return [
+        (start, stop) for start, stop in zip(boundaries, boundaries[1:])
+        if start < stop
+    ]
+
+def read_shard(file: str, start: int, stop: int) -> Generator[str, None, None]:
+    '''
+    Builds a generator yielding each line of a shard of the input file.
+
+    Parameters
+    ----------
+    file : str
+        Path to the input file.
+    start : int
+        First byte of the shard (start of a line).
+    stop : int
+        Byte after the shard (start of a line or end of the file).
+
+    Yields
+    ------
+    Generator[str, None, None]
+        Each line of the shard.
+    '''
+    with open(file, 'rb') as handle:
+        handle.seek(start)
+        position = start
+        while position < stop:
+            line = handle.readline()
+            position += len(line)
+            yield line.decode().strip()
+
+def run_shard(
+        function: Callable[[Iterator[str]], T],
+        file: str,
+        start: int,
+        stop: int
+        ) -> T:
+    '''
+    Reduces the lines of a shard with the function of the day (worker side).
+
+    Parameters
+    ----------
+    function : Callable[[Iterator[str]], T]
+        Function taking the lines of a shard and returning its partial result.
+    file : str
+        Path to the input file.
+    start : int
+        First byte of the shard.
+    stop : int
+        Byte after the shard.
+
+    Returns
+    -------
+    T
+        Partial result of the shard.
+    '''
+    return function(read_shard(file, start, stop))
+
+def map_shards(
+        function: Callable[[Iterator[str]], T],
+        file: str,
+        processes: int | None = None
+        ) -> list[T]:
+    '''
+    Splits the input file into shards and reduces them in parallel with a
+    process pool. The function must be defined at the top level of a module so
+    it can be sent to the worker processes. The partial results are returned in
+    file order, so days where the order of the lines matters can combine them
+    sequentially.
+
+    Parameters
+    ----------
+    function : Callable[[Iterator[str]], T]
+        Function taking the lines of a shard and returning its partial result.
+    file : str
+        Path to the input file.
+    processes : int | None
+        Number of worker processes (all cores by default).
+
+    Returns
+    -------
+    list[T]
+        Partial result of each shard, in file order.
+    '''
+    processes = processes or os.cpu_count() or 1
+
+    # A few shards per process balance lines of different lengths
+    shards = shard_file(file, processes*4)
+    starts = [start for start, _ in shards]
+    stops = [stop for _, stop in shards]
+
+    with ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(
+            run_shard, [function]*len(shards), [file]*len(shards), starts, stops
+        ))